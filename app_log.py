@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+app_log.py - 应用日志与崩溃记录
+- 调用方只做级别判断和入队：记录放进内存环形缓冲区（deque，追加是原子操作，不加锁），
+  同时交给后台写线程格式化、写文件、打印到控制台（Android 上即 logcat），主线程不等磁盘和 logcat
+- 日志文件按大小轮转：app.log 超过 max_bytes 时依次改名为 app.log.1 ~ app.log.<backups>
+- 低于当前级别的方法直接替换为空函数，发布版把级别调到 warning 或 off 时，
+  log.debug(...) 只剩一次空调用，参数也不会被格式化
+- 崩溃时同步写 crash.log（同样有大小上限），附上环形缓冲区中最近的日志
+
+configure() 之前的记录先保存在缓冲区和队列中，配置后一并写出。本模块不依赖 Kivy。
+
+用法：log.info('下载图片 %s 失败: %s', url, error)
+"""
+
+import os
+import sys
+import time
+import queue
+import threading
+import traceback
+from collections import deque
+from functools import partial
+
+DEBUG, INFO, WARNING, ERROR = 10, 20, 30, 40
+OFF = 100
+LEVELS = {'debug': DEBUG, 'info': INFO, 'warning': WARNING, 'error': ERROR, 'off': OFF}
+LEVEL_NAMES = {DEBUG: 'D', INFO: 'I', WARNING: 'W', ERROR: 'E'}
+
+
+def _noop(*args, **kwargs):
+    pass
+
+
+def format_record(record):
+    created, level, thread_name, msg, args = record
+    if args:
+        try:
+            msg = msg % args
+        except (TypeError, ValueError):
+            msg = ' '.join([str(msg)] + [str(arg) for arg in args])
+    stamp = time.strftime('%m-%d %H:%M:%S', time.localtime(created))
+    return f'{stamp}.{int(created % 1 * 1000):03d} {LEVEL_NAMES.get(level, "?")} [{thread_name}] {msg}'
+
+
+def rotate(path, backups):
+    """path -> path.1 -> ... -> path.<backups>，最旧的一份丢弃"""
+    for i in range(backups, 0, -1):
+        src = f'{path}.{i - 1}' if i > 1 else path
+        if os.path.exists(src):
+            os.replace(src, f'{path}.{i}')
+    if not backups and os.path.exists(path):
+        os.remove(path)
+
+
+class _Flush:
+    """写线程处理到这里时写完之前的记录并通知等待方"""
+    __slots__ = ('done',)
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class AppLog:
+    def __init__(self, ring_size=300):
+        self.ring = deque(maxlen=ring_size)
+        self.path = None
+        self.crash_path = None
+        self.console = True
+        self.max_bytes = 256 * 1024
+        self.backups = 2
+        self._queue = queue.SimpleQueue()
+        self._writer = None
+        self._file = None
+        self._size = 0
+        self.set_level(DEBUG)
+
+    # ---------- 配置 ----------
+    def configure(self, log_dir, level='info', console=True, max_bytes=256 * 1024, backups=2, ring_size=None):
+        """读取配置后调用：设置级别、日志目录并启动写线程"""
+        self.set_level(level)
+        self.console = console
+        self.max_bytes = max_bytes
+        self.backups = backups
+        if ring_size and ring_size != self.ring.maxlen:
+            self.ring = deque(self.ring, maxlen=ring_size)
+        self.path = os.path.join(log_dir, 'app.log')
+        self.crash_path = os.path.join(log_dir, 'crash.log')
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._run, name='app-log', daemon=True)
+            self._writer.start()
+
+    def set_level(self, level):
+        self.level = LEVELS.get(level, level) if isinstance(level, str) else level
+        for name, value in (('debug', DEBUG), ('info', INFO), ('warning', WARNING), ('error', ERROR)):
+            setattr(self, name, partial(self._log, value) if value >= self.level else _noop)
+
+    # ---------- 记录 ----------
+    def _log(self, level, msg, *args):
+        record = (time.time(), level, threading.current_thread().name, msg, args)
+        self.ring.append(record)
+        self._queue.put(record)
+
+    def exception(self, msg, *args):
+        """在 except 块中调用：记录 error 级别的消息和当前异常的调用栈"""
+        if ERROR >= self.level:
+            self._log(ERROR, '%s\n%s', msg % args if args else msg, traceback.format_exc().rstrip())
+
+    def recent(self):
+        """环形缓冲区中的日志（已格式化）"""
+        return [format_record(record) for record in list(self.ring)]
+
+    # ---------- 后台写线程 ----------
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while True:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            lines = []
+            waiting = []
+            for item in batch:
+                if isinstance(item, _Flush):
+                    waiting.append(item)
+                else:
+                    lines.append(format_record(item))
+            if lines:
+                self._write(lines)
+            for item in waiting:
+                item.done.set()
+
+    def _write(self, lines):
+        text = '\n'.join(lines) + '\n'
+        if self.console:
+            try:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+            except Exception:
+                pass
+        try:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._file = open(self.path, 'a', encoding='utf-8')
+                self._size = self._file.tell()
+            data = text.encode('utf-8')
+            self._file.write(text)
+            self._file.flush()
+            self._size += len(data)
+            if self._size >= self.max_bytes:
+                self._file.close()
+                self._file = None
+                rotate(self.path, self.backups)
+        except OSError:
+            self._file = None
+
+    def flush(self, timeout=1.0):
+        """等写线程写完已入队的记录，返回是否在超时前完成"""
+        if self._writer is None:
+            return False
+        marker = _Flush()
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
+    # ---------- 崩溃 ----------
+    def dump_crash(self, exc_type, exc_value, exc_traceback, header=''):
+        """同步写 crash.log：调用栈和崩溃前最近的日志。写线程可能来不及运行，这里不经过队列"""
+        text = ''.join(traceback.format_exception(exc_type, exc_value, exc_traceback))
+        try:
+            self._write_crash(text, header)
+        finally:
+            # 不受级别限制，也写进 app.log
+            self._log(ERROR, '未捕获的异常\n%s', text.rstrip())
+
+    def _write_crash(self, text, header):
+        if not self.crash_path:
+            return
+        os.makedirs(os.path.dirname(self.crash_path), exist_ok=True)
+        try:
+            if os.path.getsize(self.crash_path) >= self.max_bytes:
+                rotate(self.crash_path, 1)
+        except OSError:
+            pass
+        with open(self.crash_path, 'a', encoding='utf-8') as f:
+            f.write(f'==================== {time.strftime("%Y-%m-%d %H:%M:%S")} {header} ====================\n')
+            f.write(text)
+            f.write(f'---------- 最近 {len(self.ring)} 条日志 ----------\n')
+            f.write('\n'.join(self.recent()) + '\n\n')
+
+
+log = AppLog()
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+blessing_index.py - 祝福语检索索引
+- SearchIndex：全文检索（汉字二元组倒排）+ 拼音首字母检索（如 “mnkl” 找 “马年快乐”）
+- FacetIndex：把各节日里名称不同但对象/风格相同的分类（长辈安康、敬重长辈、长辈恩师……）
+  归一成标签，预先算好 标签 → (节日, 分类, 条目区间)，查询为一次字典查找
+
+索引只在语料加载完成后构建一次（后台线程），查询不再扫描整个语料库。
+拼音首字母不依赖第三方库：GB2312 一级汉字按拼音排序，按编码区间即可得到首字母；
+二级汉字与常见多音字用小表补充。
+"""
+
+import heapq
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+
+# GB2312 一级汉字各首字母的起始编码
+_GB2312_INITIALS = (
+    (0xB0A1, 'a'), (0xB0C5, 'b'), (0xB2C1, 'c'), (0xB4EE, 'd'), (0xB6EA, 'e'),
+    (0xB7A2, 'f'), (0xB8C1, 'g'), (0xB9FE, 'h'), (0xBBF7, 'j'), (0xBFA6, 'k'),
+    (0xC0AC, 'l'), (0xC2E8, 'm'), (0xC4C3, 'n'), (0xC5B6, 'o'), (0xC5BE, 'p'),
+    (0xC6DA, 'q'), (0xC8BB, 'r'), (0xC8F6, 's'), (0xCBFA, 't'), (0xCDDA, 'w'),
+    (0xCEF4, 'x'), (0xD1B9, 'y'), (0xD4D1, 'z'),
+)
+_GB2312_LEVEL1_END = 0xD7F9
+_GB2312_STARTS = [start for start, _ in _GB2312_INITIALS]
+
+# 不在 GB2312 一级字库中、但祝福语里出现的汉字
+_EXTRA_INITIALS = {
+    '薇': 'w', '阖': 'h', '骐': 'q', '骥': 'j', '驽': 'n', '秣': 'm', '鳌': 'a', '缰': 'j',
+    '叽': 'j', '潇': 'x', '矍': 'j', '铄': 's', '晖': 'h', '遛': 'l', '踵': 'z', '慵': 'y',
+    '飙': 'b', '烊': 'y', '璀': 'c', '璨': 'c', '馨': 'x', '恙': 'y', '皎': 'j', '魅': 'm',
+    '颦': 'p', '铠': 'k', '葩': 'p', '逍': 'x', '懵': 'm', '粽': 'z', '萦': 'y', '诠': 'q',
+    '笃': 'd', '憧': 'c', '憬': 'j', '熠': 'y', '葆': 'b', '彷': 'p', '徨': 'h', '泯': 'm',
+    '砥': 'd', '砺': 'l', '赓': 'g', '礴': 'b', '帷': 'w', '幄': 'w', '穹': 'q', '恪': 'k',
+    '嘚': 'd',
+}
+
+# 常见多音字：第一个字母之外的读音也能匹配（如 “长辈” 既可输 cb 也可输 zb）
+_POLYPHONES = {
+    '长': 'cz', '行': 'xh', '乐': 'ly', '重': 'zc', '朝': 'zc', '传': 'cz', '调': 'dt',
+    '便': 'bp', '曾': 'cz', '藏': 'cz', '参': 'cs', '率': 'ls', '弹': 'dt', '降': 'jx',
+    '省': 'sx', '校': 'xj', '会': 'hk', '仔': 'z', '折': 'zs', '颤': 'cz', '系': 'xj',
+}
+
+# 分类名关键字 → 归一化标签（顺序即界面上的显示顺序，一个分类可以属于多个标签）
+FACET_RULES = (
+    ('长辈', ('长辈', '母亲', '父亲', '妈妈', '婆婆', '岳母', '公公', '岳父')),
+    ('恩师', ('恩师',)),
+    ('职场', ('职场', '商务', '企业', '白领', '文职', '实体服务')),
+    ('亲友', ('亲友', '家庭', '团圆')),
+    ('女性', ('女性', '妈妈', '母亲', '婆婆', '岳母', '优雅', '独立')),
+    ('通用', ('通用',)),
+    ('温情', ('深情', '温柔', '温馨', '暖心', '治愈')),
+    ('文艺', ('文艺', '雅致', '唯美')),
+    ('幽默', ('幽默', '搞怪', '童趣')),
+)
+
+SearchResult = namedtuple('SearchResult', 'festival category index text score')
+FacetRange = namedtuple('FacetRange', 'festival category start stop')
+
+
+def _is_han(ch):
+    return '一' <= ch <= '鿿'
+
+
+def normalize(text):
+    """只保留汉字、字母和数字（小写），标点和空白不参与检索"""
+    return ''.join(ch for ch in text.lower() if _is_han(ch) or (ch.isascii() and ch.isalnum()))
+
+
+_initials_cache = {}
+
+
+def char_initials(ch):
+    """单个字符可能的拼音首字母（多音字返回多个，无法识别返回空串）"""
+    cached = _initials_cache.get(ch)
+    if cached is None:
+        cached = _initials_cache[ch] = _lookup_initials(ch)
+    return cached
+
+
+def _lookup_initials(ch):
+    if ch in _POLYPHONES:
+        return _POLYPHONES[ch]
+    if ch.isascii():
+        return ch if ch.isalnum() else ''
+    if ch in _EXTRA_INITIALS:
+        return _EXTRA_INITIALS[ch]
+    try:
+        raw = ch.encode('gb2312')
+    except (UnicodeEncodeError, LookupError):
+        return ''
+    if len(raw) != 2:
+        return ''
+    code = raw[0] << 8 | raw[1]
+    if code < _GB2312_STARTS[0] or code > _GB2312_LEVEL1_END:
+        return ''
+    return _GB2312_INITIALS[bisect_right(_GB2312_STARTS, code) - 1][1]
+
+
+def pinyin_key(normalized):
+    """返回 (首字母串, {位置: 其他可选首字母})；无法识别的字用 '?' 占位"""
+    key = []
+    alts = {}
+    for pos, ch in enumerate(normalized):
+        options = char_initials(ch)
+        key.append(options[:1] or '?')
+        if len(options) > 1:
+            alts[pos] = options[1:]
+    return ''.join(key), alts
+
+
+def _grams(text):
+    if len(text) == 1:
+        return [text]
+    return [text[i:i + 2] for i in range(len(text) - 1)]
+
+
+def _initial_grams(key, alts):
+    """首字母二元组（多音字展开所有组合）"""
+    grams = set()
+    for i in range(len(key) - 1):
+        for a in key[i] + alts.get(i, ''):
+            for b in key[i + 1] + alts.get(i + 1, ''):
+                grams.add(a + b)
+    return grams
+
+
+def _match_initials(key, alts, query):
+    """在首字母串中查找 query，返回起始位置，找不到返回 -1"""
+    n = len(query)
+    for start in range(len(key) - n + 1):
+        for j in range(n):
+            pos = start + j
+            if query[j] != key[pos] and query[j] not in alts.get(pos, ''):
+                break
+        else:
+            return start
+    return -1
+
+
+class SearchIndex:
+    """全部祝福语的倒排索引：汉字二元组 + 拼音首字母二元组"""
+
+    def __init__(self, data):
+        self._data = data
+        self._locations = []
+        self._keys = []
+        self._alts = {}
+        postings = {}
+        for festival, festival_data in data.items():
+            for category, blessings in festival_data.items():
+                for index, text in enumerate(blessings):
+                    eid = len(self._locations)
+                    self._locations.append((festival, category, index))
+                    norm = normalize(text)
+                    key, alts = pinyin_key(norm)
+                    self._keys.append(key)
+                    if alts:
+                        self._alts[eid] = alts
+                    terms = set(norm)
+                    terms.update(_grams(norm))
+                    terms.update('#' + g for g in _initial_grams(key, alts))
+                    for term in terms:
+                        plist = postings.get(term)
+                        if plist is None:
+                            plist = postings[term] = array('I')
+                        plist.append(eid)
+        self._postings = postings
+
+    def __len__(self):
+        return len(self._locations)
+
+    def _text(self, eid):
+        festival, category, index = self._locations[eid]
+        return self._data[festival][category][index]
+
+    def search(self, query, limit=50):
+        """返回按相关度排序的 SearchResult 列表"""
+        q = normalize(query)
+        if not q:
+            return []
+        if q.isascii() and q.isalpha() and len(q) > 1:
+            return self._search_initials(q, limit)
+        return self._search_text(q, limit)
+
+    def _search_text(self, q, limit):
+        grams = set(_grams(q))
+        lists = sorted((self._postings.get(g, ()) for g in grams), key=len)
+        # 先取包含全部二元组的条目（集合求交，按语料顺序），再验证是否连续出现
+        full = set(lists[0])
+        for plist in lists[1:]:
+            if not full:
+                break
+            full.intersection_update(plist)
+        # 查询不超过两个字时，命中二元组本身就意味着连续出现，无需再解码验证
+        verify = len(q) > 2
+        exact, loose = [], []
+        for eid in sorted(full):
+            if not verify or q in normalize(self._text(eid)):
+                exact.append(eid)
+                if len(exact) >= limit:
+                    break
+            elif len(loose) < limit:
+                loose.append(eid)
+        results = [self._result(eid, self._text(eid), 2.0) for eid in exact]
+        results += [self._result(eid, self._text(eid), 1.0) for eid in loose[:limit - len(results)]]
+        if len(results) >= limit or len(grams) == 1:
+            return results
+
+        # 完全匹配不足时，用至少命中一半二元组的条目补足
+        hits = {}
+        for plist in lists:
+            for eid in plist:
+                hits[eid] = hits.get(eid, 0) + 1
+        need = max(1, (len(grams) + 1) // 2)
+        partial = heapq.nlargest(limit - len(results),
+                                 ((count, -eid) for eid, count in hits.items()
+                                  if need <= count < len(grams)))
+        for count, neg_eid in partial:
+            results.append(self._result(-neg_eid, self._text(-neg_eid), count / len(grams)))
+        return results
+
+    def _search_initials(self, q, limit):
+        lists = [self._postings.get('#' + g) for g in set(_grams(q))]
+        if not all(lists):
+            return []
+        lists.sort(key=len)
+        candidates = set(lists[0])
+        for plist in lists[1:]:
+            candidates.intersection_update(plist)
+            if not candidates:
+                return []
+        # 按语料顺序逐条验证首字母是否连续匹配，凑够一批后按匹配位置排序
+        results = []
+        for eid in sorted(candidates):
+            key = self._keys[eid]
+            pos = 0 if len(q) == 2 else _match_initials(key, self._alts.get(eid, {}), q)
+            if pos >= 0:
+                results.append((pos, eid))
+                if len(results) >= limit * 2:
+                    break
+        results.sort()
+        return [self._result(eid, self._text(eid), 1.0) for _, eid in results[:limit]]
+
+    def _result(self, eid, text, score):
+        festival, category, index = self._locations[eid]
+        return SearchResult(festival, category, index, text, score)
+
+
+def category_tags(category):
+    """分类名对应的归一化标签"""
+    return [tag for tag, keywords in FACET_RULES if any(k in category for k in keywords)]
+
+
+class FacetIndex:
+    """标签 → 跨节日的 (节日, 分类, 条目区间) 列表"""
+
+    def __init__(self, data):
+        self._data = data
+        self._ranges = {tag: [] for tag, _ in FACET_RULES}
+        self._counts = dict.fromkeys(self._ranges, 0)
+        for festival, festival_data in data.items():
+            for category, blessings in festival_data.items():
+                count = len(blessings)
+                if not count:
+                    continue
+                for tag in category_tags(category):
+                    self._ranges[tag].append(FacetRange(festival, category, 0, count))
+                    self._counts[tag] += count
+
+    def tags(self):
+        """有内容的标签（按 FACET_RULES 顺序）"""
+        return [tag for tag, count in self._counts.items() if count]
+
+    def count(self, tag):
+        return self._counts.get(tag, 0)
+
+    def ranges(self, tag):
+        return self._ranges.get(tag, [])
+
+    def entries(self, tag):
+        """依次产出 (节日, 分类, 序号, 祝福语)，只解码该标签下的条目"""
+        for r in self.ranges(tag):
+            blessings = self._data[r.festival][r.category]
+            for index in range(r.start, r.stop):
+                yield r.festival, r.category, index, blessings[index]
@@ -7,8 +7,12 @@ version.regex = APP_VERSION = ["']v(.*?)["']
 version.filename = %(source.dir)s/main.py
 
 source.dir = .
-source.include_exts = py,png,jpg,txt,json
-source.include_patterns = images/*.png, images/*.jpg, data/*.json
+source.include_exts = py,png,jpg,txt,json,bin,atlas,ttf
+# 运行时只打包 tools/build_images.py 生成的按密度压缩的图片，原图仅作构建输入
+# 字体只打包 tools/build_font.py 生成的子集，完整字体不放进项目目录
+source.include_patterns = images/dist/*, data/*.json, data/*.bin, fonts/bless_subset.*
+source.exclude_patterns = images/*.png, images/*.jpg, fonts/*.txt
+source.exclude_dirs = tools, cache
 
 requirements = python3,kivy==2.2.1,pyjnius==1.4.0
 
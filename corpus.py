@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+"""
+corpus.py - 祝福语二进制语料库
+由 data/bless.json 预编译生成 data/bless.bin，运行时通过 mmap 打开，
+只有在某个分类真正显示时才解码对应的字符串。
+
+文件布局（小端）：
+- 文件头：魔数、格式版本、语料修订号、内容哈希、节日/分类/条目数量
+- 节日表：每项 (名称偏移, 名称长度, 首个分类序号, 分类数)
+- 分类表：每项 (名称偏移, 名称长度, 首个条目序号, 条目数)
+- 条目偏移表：n_entries + 1 个 uint32，第 i 条文本为 blob[off[i]:off[i+1]]
+- 文本区：所有祝福语（随后是节日名、分类名）拼接成的一整块 UTF-8
+
+构建：python corpus.py data/bless.json data/bless.bin --revision N
+
+增量更新：服务器按客户端当前的内容哈希下发增量（见 apply_delta），客户端应用后校验
+新内容哈希，再编译成新的二进制语料库。生成增量：
+python corpus.py new.json delta.json --delta-from old.json --revision N
+"""
+
+import os
+import sys
+import json
+import mmap
+import struct
+import difflib
+import hashlib
+from array import array
+from collections.abc import Mapping, Sequence
+
+MAGIC = b'BLSB'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHHI32sIIII')
+TABLE_ROW = struct.Struct('<IIII')
+
+
+def canonical_hash(data):
+    """语料内容哈希（与 JSON 的缩进、换行无关），用于版本校验"""
+    raw = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(raw.encode('utf-8')).digest()
+
+
+def compile_corpus(data, out_path, revision=0):
+    """把 {节日: {分类: [祝福语]}} 写成二进制语料库（先写临时文件再原子替换）"""
+    blob = bytearray()
+    offsets = array('I')
+    festivals = []
+    categories = []
+    for festival, festival_data in data.items():
+        first_cat = len(categories)
+        for category, blessings in festival_data.items():
+            first_entry = len(offsets)
+            for text in blessings:
+                offsets.append(len(blob))
+                blob += text.encode('utf-8')
+            categories.append([category, first_entry, len(offsets) - first_entry])
+        festivals.append([festival, first_cat, len(categories) - first_cat])
+    offsets.append(len(blob))
+
+    def add_name(name):
+        raw = name.encode('utf-8')
+        off = len(blob)
+        blob.extend(raw)
+        return off, len(raw)
+
+    fest_rows = [TABLE_ROW.pack(*add_name(name), first, count) for name, first, count in festivals]
+    cat_rows = [TABLE_ROW.pack(*add_name(name), first, count) for name, first, count in categories]
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+
+    blob_offset = (HEADER.size + TABLE_ROW.size * (len(festivals) + len(categories))
+                   + offsets.itemsize * len(offsets))
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, revision, canonical_hash(data),
+                         len(festivals), len(categories), len(offsets) - 1, blob_offset)
+
+    tmp_path = out_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.writelines(fest_rows)
+        f.writelines(cat_rows)
+        f.write(offsets.tobytes())
+        f.write(blob)
+    os.replace(tmp_path, out_path)
+    return len(offsets) - 1
+
+
+def materialize(data):
+    """{节日: {分类: [祝福语]}} 的普通 dict 副本（BlessingStore 会被全部解码）"""
+    return {festival: {category: list(blessings) for category, blessings in festival_data.items()}
+            for festival, festival_data in data.items()}
+
+
+def apply_delta(data, delta):
+    """把增量应用到 data（普通 dict，不会被修改），返回新语料。delta 格式：
+    {
+      "from_hash": 基础版本的内容哈希（十六进制）,
+      "revision": 新修订号, "hash": 新版本的内容哈希,
+      "changes": [
+        {"festival": 节日, "category": 分类, "set": {"序号": 文本}, "remove": [序号], "add": [文本]},
+        {"festival": 节日, "category": 分类, "drop": true},    # 删除分类（省略 category 时删除整个节日）
+      ],
+      "festival_order": [节日, ...],                          # 可选：节日或分类顺序有变化时给出
+      "category_order": {节日: [分类, ...]}
+    }
+    序号都指基础版本中的位置，按 替换 → 删除 → 末尾追加 的顺序执行。
+    基础版本或结果哈希不符时抛出 ValueError。"""
+    if delta.get('from_hash') != canonical_hash(data).hex():
+        raise ValueError('增量的基础版本与本地语料不一致')
+    result = materialize(data)
+    for change in delta.get('changes', ()):
+        festival = change['festival']
+        category = change.get('category')
+        if change.get('drop'):
+            if category is None:
+                result.pop(festival, None)
+            else:
+                festival_data = result.get(festival, {})
+                festival_data.pop(category, None)
+                if not festival_data:
+                    result.pop(festival, None)
+            continue
+        blessings = result.setdefault(festival, {}).setdefault(category, [])
+        for index, text in change.get('set', {}).items():
+            blessings[int(index)] = text
+        for index in sorted({int(i) for i in change.get('remove', ())}, reverse=True):
+            del blessings[index]
+        blessings.extend(change.get('add', ()))
+    for festival, order in delta.get('category_order', {}).items():
+        if festival in result:
+            result[festival] = {category: result[festival][category] for category in order}
+    if 'festival_order' in delta:
+        result = {festival: result[festival] for festival in delta['festival_order']}
+    if canonical_hash(result).hex() != delta.get('hash'):
+        raise ValueError('应用增量后内容哈希不符')
+    return result
+
+
+def _category_change(before, after):
+    """一个分类的 set / remove / add。优先按 difflib 的对齐结果生成（中间删除只记序号）；
+    中间插入无法用“末尾追加”表达，这时退回按位置逐条比较"""
+    replaced, removed, added = {}, [], []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, before, after, autojunk=False).get_opcodes():
+        if tag == 'equal':
+            continue
+        if tag == 'insert' and i1 == len(before):
+            added.extend(after[j1:j2])
+        elif tag in ('replace', 'delete') and j2 - j1 <= i2 - i1:
+            replaced.update((str(i1 + k), after[j1 + k]) for k in range(j2 - j1))
+            removed.extend(range(i1 + j2 - j1, i2))
+        else:
+            common = min(len(before), len(after))
+            replaced = {str(i): after[i] for i in range(common) if before[i] != after[i]}
+            removed = list(range(len(after), len(before)))
+            added = after[len(before):]
+            break
+    change = {}
+    if replaced:
+        change['set'] = replaced
+    if removed:
+        change['remove'] = removed
+    if added:
+        change['add'] = added
+    return change
+
+
+def make_delta(old, new, revision):
+    """生成从 old 到 new 的增量（服务器端使用）"""
+    changes = []
+    for festival, festival_data in new.items():
+        old_festival = old.get(festival, {})
+        for category, blessings in festival_data.items():
+            change = _category_change(list(old_festival.get(category, ())), list(blessings))
+            if change:
+                changes.append(dict(festival=festival, category=category, **change))
+        for category in old_festival:
+            if category not in festival_data:
+                changes.append({'festival': festival, 'category': category, 'drop': True})
+    for festival in old:
+        if festival not in new:
+            changes.append({'festival': festival, 'drop': True})
+
+    delta = {
+        'from_hash': canonical_hash(old).hex(),
+        'revision': revision,
+        'hash': canonical_hash(new).hex(),
+        'changes': changes,
+    }
+    # 应用时新增的节日、分类追加在末尾，与 new 的顺序不同时附上完整顺序
+    def appended(before, after):
+        return [key for key in before if key in after] + [key for key in after if key not in before]
+
+    if list(new) != appended(old, new):
+        delta['festival_order'] = list(new)
+    category_order = {festival: list(festival_data) for festival, festival_data in new.items()
+                      if list(festival_data) != appended(old.get(festival, {}), festival_data)}
+    if category_order:
+        delta['category_order'] = category_order
+    return delta
+
+
+class CategoryView(Sequence):
+    """一个分类下的祝福语，按需从 mmap 解码"""
+
+    def __init__(self, store, start, stop):
+        self._store = store
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('blessing index out of range')
+        return self._store.text(self.start + index)
+
+    def __iter__(self):
+        text = self._store.text
+        for i in range(self.start, self.stop):
+            yield text(i)
+
+
+class FestivalView(Mapping):
+    """一个节日下的 {分类: CategoryView}，保持原始顺序"""
+
+    def __init__(self, store, first_cat, n_cat):
+        self._store = store
+        self._categories = {}
+        for i in range(first_cat, first_cat + n_cat):
+            name, start, count = store._category_row(i)
+            self._categories[name] = (start, start + count)
+
+    def __getitem__(self, category):
+        start, stop = self._categories[category]
+        return CategoryView(self._store, start, stop)
+
+    def __iter__(self):
+        return iter(self._categories)
+
+    def __len__(self):
+        return len(self._categories)
+
+    def entry_range(self, category):
+        return self._categories[category]
+
+
+class BlessingStore(Mapping):
+    """只读语料库，对外表现为 {节日: {分类: [祝福语]}}，与 json.load 的结果用法一致"""
+
+    def __init__(self, buf):
+        self._buf = buf
+        (magic, version, _, self.revision, self.content_hash,
+         n_fest, n_cat, n_entries, blob_offset) = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError('不是祝福语语料库文件')
+        if version != FORMAT_VERSION:
+            raise ValueError(f'不支持的语料库版本: {version}')
+        self._fest_base = HEADER.size
+        self._cat_base = self._fest_base + TABLE_ROW.size * n_fest
+        off_base = self._cat_base + TABLE_ROW.size * n_cat
+        self._offsets = memoryview(buf)[off_base:off_base + 4 * (n_entries + 1)].cast('I')
+        if sys.byteorder != 'little':
+            self._offsets = array('I', self._offsets)
+            self._offsets.byteswap()
+        self._blob_offset = blob_offset
+        self.entry_count = n_entries
+        self._festivals = {}
+        for i in range(n_fest):
+            name_off, name_len, first, count = TABLE_ROW.unpack_from(buf, self._fest_base + TABLE_ROW.size * i)
+            self._festivals[self._name(name_off, name_len)] = (first, count)
+        self._views = {}
+
+    @classmethod
+    def open(cls, path):
+        with open(path, 'rb') as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buf)
+
+    def _name(self, off, length):
+        start = self._blob_offset + off
+        return self._buf[start:start + length].decode('utf-8')
+
+    def _category_row(self, i):
+        name_off, name_len, first, count = TABLE_ROW.unpack_from(self._buf, self._cat_base + TABLE_ROW.size * i)
+        return self._name(name_off, name_len), first, count
+
+    def text(self, i):
+        """按全局条目序号解码一条祝福语"""
+        start = self._blob_offset + self._offsets[i]
+        stop = self._blob_offset + self._offsets[i + 1]
+        return self._buf[start:stop].decode('utf-8')
+
+    def __getitem__(self, festival):
+        view = self._views.get(festival)
+        if view is None:
+            first, count = self._festivals[festival]
+            view = self._views[festival] = FestivalView(self, first, count)
+        return view
+
+    def __iter__(self):
+        return iter(self._festivals)
+
+    def __len__(self):
+        return len(self._festivals)
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description='把 bless.json 编译成 mmap 二进制语料库')
+    parser.add_argument('source', nargs='?', default=os.path.join('data', 'bless.json'))
+    parser.add_argument('output', nargs='?', default=os.path.join('data', 'bless.bin'))
+    parser.add_argument('--revision', type=int, default=0, help='语料修订号')
+    parser.add_argument('--delta-from', metavar='OLD_JSON', help='输出相对旧版本 JSON 的增量，而不是二进制语料库')
+    args = parser.parse_args(argv)
+    with open(args.source, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if args.delta_from:
+        with open(args.delta_from, 'r', encoding='utf-8') as f:
+            old = json.load(f)
+        delta = make_delta(old, data, args.revision)
+        apply_delta(old, delta)  # 生成后自检
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(delta, f, ensure_ascii=False, separators=(',', ':'))
+        print(f'{args.output}: {len(delta["changes"])} 处变更, {os.path.getsize(args.output)} 字节')
+        return
+    count = compile_corpus(data, args.output, args.revision)
+    print(f'{args.output}: {len(data)} 个节日, {count} 条祝福语, {os.path.getsize(args.output)} 字节')
+
+
+if __name__ == '__main__':
+    main()
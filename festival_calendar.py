@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+festival_calendar.py - 节日日历
+节日目录 FESTIVALS 是唯一的数据来源：每个节日属于 传统佳节 / 职业节日 之一，日期规则为
+- 公历固定日期（如 国庆节 10 月 1 日）
+- 农历日期（春节、开工大吉、元宵节、端午节、中秋节），按农历表换算为公历
+- 某月第几个星期几（母亲节：5 月第二个星期日；父亲节：6 月第三个星期日）
+
+FestivalCalendar 对一段年份预先算出按日期排序的 (日期, 节日) 表，
+“某天之后最近的节日”用二分查找回答。农历表覆盖 1900 ~ 2099 年。
+
+运行时直接按当天日期计算，不读取任何预先生成的日期表。
+查看某年各节日的日期：python festival_calendar.py --year 2026
+"""
+
+import sys
+import argparse
+from bisect import bisect_left
+from collections import namedtuple
+from datetime import date, timedelta
+from itertools import accumulate
+
+# 农历 1900 ~ 2099 年每年的月份信息（与常见的 lunarInfo 表同一编码）：
+# 低 4 位为闰月月份（0 表示无闰月）；第 15 ~ 4 位依次为 1 ~ 12 月，1 表示大月（30 天）；
+# 第 16 位为闰月是否大月
+_LUNAR_YEAR_INFO = (
+    0x04bd8, 0x04ae0, 0x0a570, 0x054d5, 0x0d260, 0x0d950, 0x16554, 0x056a0, 0x09ad0, 0x055d2,  # 1900
+    0x04ae0, 0x0a5b6, 0x0a4d0, 0x0d250, 0x1d255, 0x0b540, 0x0d6a0, 0x0ada2, 0x095b0, 0x14977,  # 1910
+    0x04970, 0x0a4b0, 0x0b4b5, 0x06a50, 0x06d40, 0x1ab54, 0x02b60, 0x09570, 0x052f2, 0x04970,  # 1920
+    0x06566, 0x0d4a0, 0x0ea50, 0x06e95, 0x05ad0, 0x02b60, 0x186e3, 0x092e0, 0x1c8d7, 0x0c950,  # 1930
+    0x0d4a0, 0x1d8a6, 0x0b550, 0x056a0, 0x1a5b4, 0x025d0, 0x092d0, 0x0d2b2, 0x0a950, 0x0b557,  # 1940
+    0x06ca0, 0x0b550, 0x15355, 0x04da0, 0x0a5d0, 0x14573, 0x052b0, 0x0a9a8, 0x0e950, 0x06aa0,  # 1950
+    0x0aea6, 0x0ab50, 0x04b60, 0x0aae4, 0x0a570, 0x05260, 0x0f263, 0x0d950, 0x05b57, 0x056a0,  # 1960
+    0x096d0, 0x04dd5, 0x04ad0, 0x0a4d0, 0x0d4d4, 0x0d250, 0x0d558, 0x0b540, 0x0b5a0, 0x195a6,  # 1970
+    0x095b0, 0x049b0, 0x0a974, 0x0a4b0, 0x0b27a, 0x06a50, 0x06d40, 0x0af46, 0x0ab60, 0x09570,  # 1980
+    0x04af5, 0x04970, 0x064b0, 0x074a3, 0x0ea50, 0x06b58, 0x05ac0, 0x0ab60, 0x096d5, 0x092e0,  # 1990
+    0x0c960, 0x0d954, 0x0d4a0, 0x0da50, 0x07552, 0x056a0, 0x0abb7, 0x025d0, 0x092d0, 0x0cab5,  # 2000
+    0x0a950, 0x0b4a0, 0x0baa4, 0x0ad50, 0x055d9, 0x04ba0, 0x0a5b0, 0x15176, 0x052b0, 0x0a930,  # 2010
+    0x07954, 0x06aa0, 0x0ad50, 0x05b52, 0x04b60, 0x0a6e6, 0x0a4e0, 0x0d260, 0x0ea65, 0x0d530,  # 2020
+    0x05aa0, 0x076a3, 0x096d0, 0x04afb, 0x04ad0, 0x0a4d0, 0x1d0b6, 0x0d250, 0x0d520, 0x0dd45,  # 2030
+    0x0b5a0, 0x056d0, 0x055b2, 0x049b0, 0x0a577, 0x0a4b0, 0x0aa50, 0x1b255, 0x06d20, 0x0ada0,  # 2040
+    0x14b63, 0x09370, 0x049f8, 0x04970, 0x064b0, 0x168a6, 0x0ea50, 0x06aa0, 0x1a6c4, 0x0aae0,  # 2050
+    0x092e0, 0x0d2e3, 0x0c960, 0x0d557, 0x0d4a0, 0x0da50, 0x05d55, 0x056a0, 0x0a6d0, 0x055d4,  # 2060
+    0x052d0, 0x0a9b8, 0x0a950, 0x0b4a0, 0x0b6a6, 0x0ad50, 0x055a0, 0x0aba4, 0x0a5b0, 0x052b0,  # 2070
+    0x0b273, 0x06930, 0x07337, 0x06aa0, 0x0ad50, 0x14b55, 0x04b60, 0x0a570, 0x054e4, 0x0d160,  # 2080
+    0x0e968, 0x0d520, 0x0daa0, 0x16aa6, 0x056d0, 0x04ae0, 0x0a9d4, 0x0a2d0, 0x0d150, 0x0f252,  # 2090
+)
+_LUNAR_FIRST_YEAR = 1900
+_LUNAR_EPOCH = date(1900, 1, 31)  # 农历 1900 年正月初一
+
+
+def _leap_month(info):
+    return info & 0xF
+
+
+def _leap_month_days(info):
+    if not _leap_month(info):
+        return 0
+    return 30 if info & 0x10000 else 29
+
+
+def _month_days(info, month):
+    return 30 if info & (0x10000 >> month) else 29
+
+
+def _year_days(info):
+    return sum(_month_days(info, m) for m in range(1, 13)) + _leap_month_days(info)
+
+
+# 每个农历年正月初一距 _LUNAR_EPOCH 的天数
+_YEAR_OFFSETS = (0,) + tuple(accumulate(_year_days(info) for info in _LUNAR_YEAR_INFO))
+
+
+def lunar_to_solar(year, month, day):
+    """农历（非闰月）日期转公历 date"""
+    index = year - _LUNAR_FIRST_YEAR
+    if not 0 <= index < len(_LUNAR_YEAR_INFO):
+        raise ValueError(f'农历年份超出范围: {year}')
+    info = _LUNAR_YEAR_INFO[index]
+    if not 1 <= day <= _month_days(info, month):
+        raise ValueError(f'农历日期无效: {year}-{month}-{day}')
+    offset = _YEAR_OFFSETS[index]
+    for m in range(1, month):
+        offset += _month_days(info, m)
+        if m == _leap_month(info):
+            offset += _leap_month_days(info)
+    return _LUNAR_EPOCH + timedelta(days=offset + day - 1)
+
+
+# ---------- 日期规则 ----------
+def solar(month, day):
+    return lambda year: date(year, month, day)
+
+
+def lunar(month, day):
+    return lambda year: lunar_to_solar(year, month, day)
+
+
+def nth_weekday(month, weekday, n):
+    """某月第 n 个星期几（weekday: 0 为星期一，6 为星期日）"""
+    def rule(year):
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    return rule
+
+
+TRADITIONAL = 'traditional'
+PROFESSIONAL = 'professional'
+
+Festival = namedtuple('Festival', 'name group rule')
+
+# 顺序即下拉菜单中的顺序
+FESTIVALS = (
+    Festival('春节', TRADITIONAL, lunar(1, 1)),
+    Festival('开工大吉', TRADITIONAL, lunar(1, 8)),
+    Festival('元宵节', TRADITIONAL, lunar(1, 15)),
+    Festival('母亲节', TRADITIONAL, nth_weekday(5, 6, 2)),
+    Festival('端午节', TRADITIONAL, lunar(5, 5)),
+    Festival('父亲节', TRADITIONAL, nth_weekday(6, 6, 3)),
+    Festival('中秋节', TRADITIONAL, lunar(8, 15)),
+    Festival('女神节', PROFESSIONAL, solar(3, 8)),
+    Festival('劳动节', PROFESSIONAL, solar(5, 1)),
+    Festival('青年节', PROFESSIONAL, solar(5, 4)),
+    Festival('护士节', PROFESSIONAL, solar(5, 12)),
+    Festival('儿童节', PROFESSIONAL, solar(6, 1)),
+    Festival('建党节', PROFESSIONAL, solar(7, 1)),
+    Festival('建军节', PROFESSIONAL, solar(8, 1)),
+    Festival('教师节', PROFESSIONAL, solar(9, 10)),
+    Festival('国庆节', PROFESSIONAL, solar(10, 1)),
+    Festival('记者节', PROFESSIONAL, solar(11, 8)),
+)
+
+
+def festival_names(group):
+    return [f.name for f in FESTIVALS if f.group == group]
+
+
+def festival_date(name, year):
+    for festival in FESTIVALS:
+        if festival.name == name:
+            return festival.rule(year)
+    raise KeyError(name)
+
+
+class FestivalCalendar:
+    """[first_year, last_year] 范围内所有节日的公历日期，按日期排序"""
+
+    def __init__(self, first_year, last_year):
+        self.first_year = first_year
+        self.last_year = last_year
+        entries = sorted((f.rule(year), f.name)
+                         for year in range(first_year, last_year + 1)
+                         for f in FESTIVALS)
+        self._dates = [d for d, _ in entries]
+        self._names = [name for _, name in entries]
+
+    def __len__(self):
+        return len(self._dates)
+
+    def next_festival(self, day):
+        """day 当天或之后最近的节日，返回 (名称, 日期, 相差天数)；超出范围返回 None"""
+        i = bisect_left(self._dates, day)
+        if i == len(self._dates):
+            return None
+        return self._names[i], self._dates[i], (self._dates[i] - day).days
+
+    def dates_in_year(self, year):
+        """{节日: (月, 日)}，按日期排序"""
+        lo = bisect_left(self._dates, date(year, 1, 1))
+        hi = bisect_left(self._dates, date(year + 1, 1, 1))
+        return {self._names[i]: (self._dates[i].month, self._dates[i].day) for i in range(lo, hi)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='输出某年各节日的公历日期')
+    parser.add_argument('--year', type=int, default=date.today().year)
+    args = parser.parse_args(argv)
+
+    dates = FestivalCalendar(args.year, args.year).dates_in_year(args.year)
+    for name, (month, day) in dates.items():
+        print(f'{name}\t{args.year}-{month:02d}-{day:02d}')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+http_cache.py - 持久化 HTTP 缓存
+- HttpCache：JSON 等小响应。每个 URL 在缓存目录里对应 <sha1>.body（响应正文）和
+  <sha1>.meta（ETag、Last-Modified、max-age、获取时间）。再次请求时带上
+  If-None-Match / If-Modified-Since，服务器返回 304 时只刷新元数据，不再下载正文；
+  max-age 内直接使用缓存，不发请求。
+- ImageCache：广告图片。文件名为 URL 加校验值的哈希（内容寻址），总大小超过预算时
+  按最近最少使用（LRU）淘汰；所有写入都先写临时文件再原子替换。
+  命中缓存只在内存中更新使用时间，由调用方择机调用 take_index() / write_index()
+  （或 flush()）写回 index.json，不在每次命中时写盘。
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from collections import namedtuple
+
+CachedResponse = namedtuple('CachedResponse', 'url body etag last_modified fetched_at max_age')
+
+_MAX_AGE_RE = re.compile(r'max-age\s*=\s*(\d+)', re.I)
+
+
+def _header(headers, name):
+    """响应头大小写不敏感查找"""
+    if not headers:
+        return None
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _atomic_write(path, data):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class HttpCache:
+    def __init__(self, cache_dir, default_max_age=0):
+        self.cache_dir = cache_dir
+        self.default_max_age = default_max_age
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + '.body', base + '.meta'
+
+    def get(self, url):
+        """读取缓存条目，不存在或已损坏时返回 None"""
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'r', encoding='utf-8') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        return CachedResponse(url, body, meta.get('etag'), meta.get('last_modified'),
+                              meta.get('fetched_at', 0), meta.get('max_age', self.default_max_age))
+
+    def is_fresh(self, entry):
+        return entry is not None and time.time() - entry.fetched_at < entry.max_age
+
+    def conditional_headers(self, entry):
+        """再验证请求头"""
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def _max_age(self, headers):
+        cache_control = _header(headers, 'Cache-Control') or ''
+        if 'no-cache' in cache_control.lower():
+            return 0
+        match = _MAX_AGE_RE.search(cache_control)
+        return int(match.group(1)) if match else self.default_max_age
+
+    def _write_meta(self, url, etag, last_modified, max_age):
+        _, meta_path = self._paths(url)
+        meta = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'max_age': max_age,
+            'fetched_at': time.time(),
+        }
+        _atomic_write(meta_path, json.dumps(meta).encode('utf-8'))
+
+    def store(self, url, body, headers):
+        """保存 200 响应（Cache-Control: no-store 时不缓存）"""
+        if 'no-store' in (_header(headers, 'Cache-Control') or '').lower():
+            return
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        body_path, _ = self._paths(url)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        _atomic_write(body_path, body)
+        self._write_meta(url, _header(headers, 'ETag'), _header(headers, 'Last-Modified'),
+                         self._max_age(headers))
+
+    def revalidated(self, entry, headers):
+        """304：正文不变，只刷新校验值与有效期"""
+        self._write_meta(entry.url,
+                         _header(headers, 'ETag') or entry.etag,
+                         _header(headers, 'Last-Modified') or entry.last_modified,
+                         self._max_age(headers))
+
+
+# 根据文件头识别图片类型（Kivy 按扩展名选择解码器）
+_IMAGE_SIGNATURES = (
+    (b'\x89PNG', 'png'),
+    (b'\xff\xd8', 'jpg'),
+    (b'GIF8', 'gif'),
+    (b'RIFF', 'webp'),
+)
+
+
+def _sniff_image_ext(path):
+    with open(path, 'rb') as f:
+        head = f.read(12)
+    for signature, ext in _IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return ext
+    return None
+
+
+class ImageCache:
+    """按字节预算淘汰的磁盘图片缓存，索引保存在 index.json"""
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._index_path = os.path.join(cache_dir, 'index.json')
+        self._entries = {}
+        self._dirty = False
+        self._version = 0          # 每次 take_index() 加一
+        self._written_version = 0  # 已写入磁盘的最新快照
+        self._write_lock = threading.Lock()
+        try:
+            with open(self._index_path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    @property
+    def total_bytes(self):
+        return sum(entry['size'] for entry in self._entries.values())
+
+    @property
+    def dirty(self):
+        """内存中的索引有尚未写回的变化（只是使用时间或失效条目）"""
+        return self._dirty
+
+    def take_index(self):
+        """在修改索引的线程中取出待写的快照 (版本, 内容)，没有变化时返回 None"""
+        if not self._dirty:
+            return None
+        self._dirty = False
+        self._version += 1
+        return self._version, json.dumps(self._entries).encode('utf-8')
+
+    def write_index(self, snapshot):
+        """写入 take_index() 的快照，可在任意线程调用；比已写入的快照旧时跳过"""
+        version, data = snapshot
+        with self._write_lock:
+            if version <= self._written_version:
+                return
+            os.makedirs(self.cache_dir, exist_ok=True)
+            _atomic_write(self._index_path, data)
+            self._written_version = version
+
+    def flush(self):
+        snapshot = self.take_index()
+        if snapshot is not None:
+            self.write_index(snapshot)
+
+    def _save(self):
+        self._dirty = True
+        self.flush()
+
+    def lookup(self, url):
+        """返回已缓存图片的本地路径（并记为最近使用），没有则返回 None。只改内存中的索引"""
+        entry = self._entries.get(url)
+        if entry is None:
+            return None
+        path = os.path.join(self.cache_dir, entry['file'])
+        self._dirty = True
+        if not os.path.exists(path):
+            del self._entries[url]
+            return None
+        entry['atime'] = time.time()
+        return path
+
+    def conditional_headers(self, url):
+        entry = self._entries.get(url)
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def temp_path(self, url):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.part')
+
+    def commit(self, url, tmp_path, headers):
+        """把下载完成的临时文件放入缓存，返回最终路径（不是图片时返回 None）"""
+        ext = _sniff_image_ext(tmp_path)
+        if ext is None:
+            os.remove(tmp_path)
+            return None
+        etag = _header(headers, 'ETag')
+        last_modified = _header(headers, 'Last-Modified')
+        key = hashlib.sha1('\n'.join((url, etag or '', last_modified or '')).encode('utf-8')).hexdigest()
+        filename = f'{key}.{ext}'
+        path = os.path.join(self.cache_dir, filename)
+        os.replace(tmp_path, path)
+        old = self._entries.get(url)
+        if old and old['file'] != filename:
+            self._remove_file(old['file'])
+        self._entries[url] = {
+            'file': filename,
+            'etag': etag,
+            'last_modified': last_modified,
+            'size': os.path.getsize(path),
+            'atime': time.time(),
+        }
+        self._evict(keep=url)
+        self._save()
+        return path
+
+    def _remove_file(self, filename):
+        try:
+            os.remove(os.path.join(self.cache_dir, filename))
+        except OSError:
+            pass
+
+    def _evict(self, keep=None):
+        total = self.total_bytes
+        for url in sorted(self._entries, key=lambda u: self._entries[u]['atime']):
+            if total <= self.max_bytes:
+                break
+            if url == keep:
+                continue
+            entry = self._entries.pop(url)
+            self._remove_file(entry['file'])
+            total -= entry['size']
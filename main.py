@@ -7,7 +7,8 @@ main.py - 马年送祝福（最终版）
 - 顶部标题栏（图片） + 轮播图（高度自适应，保持图片比例不变形）
 - 两个固定标题的下拉菜单（传统佳节/行业节日），小标签显示当前选中节日（加粗）
 - 自动判断下一个节日（今天或未来最近），显示“n天后节日”或直接节日名
-- 祝福语数据从 data/bless.json 加载
+- 祝福语数据从 data/bless.bin（由 data/bless.json 预编译，mmap 按需解码）加载，缺失时回退到 JSON；
+  启动后向服务器请求增量，校验后写入缓存目录并原地替换，无需发布新版本
 - 分享按钮动态启用，底部图标栏自动显示/隐藏（显示后3秒自动隐藏）
 - 下拉菜单颜色跟随激活组变化，下拉列表美观（浅米色选项，棕色分隔线，节日氛围）
 - 版本更新检查（从网络获取，正确判断有无更新，静默提示）
@@ -15,35 +16,61 @@ main.py - 马年送祝福（最终版）
 - 沉浸模式：手动下滑显示状态栏，3秒后自动隐藏，应用内容全屏无黑边
 """
 
+# 启动阶段耗时记录要最先开始；读到 config.json 之前先缓存事件
+import startup_trace
+tracer = startup_trace.Tracer()
+_module_started = tracer.now()
+
 import kivy
 import sys
 import os
 import json
-import traceback
 import hashlib
-from datetime import datetime
+import bisect
+import time
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+from datetime import datetime, timedelta
 from kivy.app import App
 from kivy.uix.screenmanager import ScreenManager, Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.floatlayout import FloatLayout
 from kivy.uix.carousel import Carousel
 from kivy.uix.scrollview import ScrollView
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
 from kivy.uix.label import Label
 from kivy.uix.button import Button
 from kivy.uix.spinner import Spinner, SpinnerOption
 from kivy.uix.dropdown import DropDown
-from kivy.uix.image import Image, AsyncImage
+from kivy.uix.image import Image
+from kivy.core.image import ImageLoader
+from kivy.loader import Loader
 from kivy.uix.popup import Popup
 from kivy.uix.textinput import TextInput
 from kivy.core.clipboard import Clipboard
 from kivy.clock import Clock
+from kivy.event import EventDispatcher
 from kivy.utils import get_color_from_hex
 from kivy.core.window import Window
-from kivy.metrics import dp, sp
+from kivy.metrics import dp, sp, Metrics
 from kivy.graphics import Color, Rectangle, RoundedRectangle
-from kivy.core.text import LabelBase
+from kivy.core.text import LabelBase, Label as CoreLabel
 from kivy.animation import Animation
-from kivy.network.urlrequest import UrlRequest
+from kivy.properties import BooleanProperty, StringProperty
+
+from corpus import BlessingStore, canonical_hash, compile_corpus, materialize, apply_delta
+from blessing_index import SearchIndex, FacetIndex, FACET_RULES
+from http_cache import HttpCache, ImageCache
+from net_client import NetClient, NetError
+from update_checker import UpdateChecker
+import festival_calendar
+import platform_services
+from app_log import log
+
+tracer.complete('导入依赖', _module_started)
 
 APP_VERSION = "v2.6.1024"
 
@@ -55,22 +82,354 @@ if not os.path.exists(CACHE_DIR):
     except:
         pass
 
-# ---------- 注册系统字体 ----------
+# ---------- 应用配置 ----------
+def load_config():
+    path = os.path.join(os.path.dirname(__file__), 'config.json')
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        log.warning('读取 config.json 失败: %s', e)
+        return {}
+
+APP_CONFIG = load_config()
+
+# ---------- 日志（config.json 的 logging；发布版可把 level 调到 warning 或 off，并关闭 console） ----------
+LOG_DIR = os.path.join(os.getenv('ANDROID_PRIVATE', CACHE_DIR), 'logs')
+_log_config = APP_CONFIG.get('logging', {})
+log.configure(LOG_DIR,
+              level=_log_config.get('level', 'info'),
+              console=_log_config.get('console', True),
+              max_bytes=_log_config.get('max_bytes', 256 * 1024),
+              backups=_log_config.get('backups', 2),
+              ring_size=_log_config.get('ring_size', 300))
+
+# ---------- 启动阶段追踪（config.json 的 startup_trace.enabled 打开时写出 Chrome trace） ----------
+_trace_config = APP_CONFIG.get('startup_trace', {})
+tracer.configure(_trace_config.get('enabled', False))
+STARTUP_TRACE_PATH = os.path.join(CACHE_DIR, 'startup_trace.json')
+# 首帧之后再等这么久才写出文件，以便包含首个网络响应
+STARTUP_TRACE_FLUSH_DELAY = _trace_config.get('flush_delay', 8)
+
+# ---------- 按屏幕密度选择图片资源 ----------
+def load_image_variants():
+    """读取构建时生成的 images/dist/variants.json（由 tools/build_images.py 生成）"""
+    path = os.path.join(os.path.dirname(__file__), 'images', 'dist', 'variants.json')
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+IMAGE_VARIANTS = load_image_variants()
+_resolved_images = {}
+
+def asset_key(path):
+    """图片的内容哈希（内容相同的图片哈希相同）；没有构建清单时用路径本身"""
+    return IMAGE_VARIANTS.get('assets', {}).get(path, path)
+
+def resolve_image(path, fill_width=True):
+    """返回最适合当前屏幕的图片变体：密度不低于屏幕 dpi 的最小一份；fill_width=True（横向铺满
+    窗口的开屏图、轮播图、标题图）时还要求宽度不小于窗口宽度。都不满足时用最大的一份。
+    没有构建变体（开发环境）时返回原路径。"""
+    resolved = _resolved_images.get((path, fill_width))
+    if resolved is not None:
+        return resolved
+    resolved = path
+    variants = IMAGE_VARIANTS.get('images', {}).get(asset_key(path))
+    if variants:
+        densities = IMAGE_VARIANTS.get('densities', {})
+        ordered = sorted(variants.items(), key=lambda item: densities.get(item[0], 0))
+        resolved = ordered[-1][1]['path']
+        for name, variant in ordered:
+            if (densities.get(name, 0) >= Metrics.density
+                    and (not fill_width or variant['size'][0] >= Window.width)):
+                resolved = variant['path']
+                break
+    _resolved_images[(path, fill_width)] = resolved
+    return resolved
+
+# 按内容哈希共享的纹理：top.jpg、top02~05.jpg 等相同内容只解码、上传一次。
+# Kivy 自带的图片缓存按文件路径区分，且过期后会重新解码，所以这里自行持有。
+_shared_textures = {}
+_texture_requests = {}
+
+def _decode_image(filename):
+    """在 Loader 的工作线程中解码像素（纹理随后在主线程上传）"""
+    try:
+        return ImageLoader.load(filename, keep_data=True)
+    except Exception as e:
+        log.warning('解码图片 %s 失败: %s', filename, e)
+        return Loader.error_image
+
+def load_asset_texture(path, callback):
+    """异步取得图片的共享纹理，就绪后在主线程回调 callback(texture)，失败时回调 None。
+    解码由 kivy.loader 在工作线程完成，纹理上传由 Loader 按帧限量进行。"""
+    key = asset_key(path)
+    texture = _shared_textures.get(key)
+    if texture is not None:
+        callback(texture)
+        return
+    waiting = _texture_requests.get(key)
+    if waiting is not None:
+        waiting.append(callback)
+        return
+    _texture_requests[key] = [callback]
+
+    def on_load(proxy):
+        texture = None
+        if proxy.image is not Loader.error_image:
+            texture = proxy.image.texture
+            if texture is not None:
+                _shared_textures[key] = texture
+        for cb in _texture_requests.pop(key, ()):
+            cb(texture)
+
+    proxy = Loader.image(resolve_image(path), load_callback=_decode_image)
+    if proxy.loaded:
+        on_load(proxy)
+    else:
+        proxy.bind(on_load=on_load)
+
+# ---------- 界面小图标图集（底部图标、轮播指示点） ----------
+def load_ui_atlas():
+    """读取构建时生成的 images/dist/atlas.json（由 tools/build_atlas.py 生成）"""
+    path = os.path.join(os.path.dirname(__file__), 'images', 'dist', 'atlas.json')
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None, ()
+    densities = manifest.get('densities', {})
+    atlases = sorted(manifest.get('atlases', {}).items(), key=lambda item: densities.get(item[0], 0))
+    if not atlases:
+        return None, ()
+    chosen = atlases[-1][1]
+    for name, atlas_path in atlases:
+        if densities.get(name, 0) >= Metrics.density:
+            chosen = atlas_path
+            break
+    return chosen[:-len('.atlas')], frozenset(manifest.get('regions', ()))
+
+UI_ATLAS, UI_ATLAS_REGIONS = load_ui_atlas()
+
+def ui_image(name):
+    """图集区域的 atlas:// 地址；没有构建图集（开发环境）时退回 images/<name>.png"""
+    if UI_ATLAS and name in UI_ATLAS_REGIONS:
+        return f'atlas://{UI_ATLAS}/{name}'
+    return resolve_image(f'images/{name}.png', fill_width=False)
+
+# ---------- 网络请求（接口地址见 config.json 的 urls，超时与重试见 network） ----------
+DEFAULT_URLS = {
+    'ads': 'https://www.sjinyu.com/tools/bless/data/ads.json',
+    'update': 'https://www.sjinyu.com/tools/bless/data/update.json',
+}
+_network_config = APP_CONFIG.get('network', {})
+_first_response_traced = False
+
+def _trace_response(url, started, result):
+    global _first_response_traced
+    if isinstance(result, NetError):
+        tracer.complete('网络请求', started, cat='net', url=url, status=result.status, error=str(result))
+    else:
+        tracer.complete('网络请求', started, cat='net', url=url, status=result.status)
+    if not _first_response_traced:
+        _first_response_traced = True
+        tracer.instant('首个网络响应', cat='net', url=url)
+
+net = NetClient(
+    {**DEFAULT_URLS, **APP_CONFIG.get('urls', {})},
+    dispatch=lambda fn: Clock.schedule_once(lambda dt: fn()),
+    timeout=_network_config.get('timeout', 10),
+    timeouts=_network_config.get('timeouts'),
+    max_retries=_network_config.get('max_retries', 2),
+    backoff=_network_config.get('backoff', 1.0),
+    observer=_trace_response if tracer.enabled else None,
+)
+
+# ---------- 检查更新（状态持久化在 CACHE_DIR，按间隔节流） ----------
+_update_config = APP_CONFIG.get('update_check', {})
+update_checker = UpdateChecker(
+    os.path.join(CACHE_DIR, 'update_state.json'), net, APP_VERSION,
+    interval=_update_config.get('interval_hours', 24) * 3600,
+)
+UPDATE_CHECK_DELAY = _update_config.get('delay', 3)
+
+# ---------- 语料增量同步（config.json 的 urls.corpus_delta 填写地址后启用，默认留空不同步） ----------
+_corpus_sync_config = APP_CONFIG.get('corpus_sync', {})
+CORPUS_CACHE_PATH = os.path.join(CACHE_DIR, 'corpus', 'bless.bin')
+# 同步缓存基于哪一份安装包自带语料（内容标识）；升级后自带语料变化时缓存作废，从新的自带语料重新同步
+CORPUS_BASE_PATH = os.path.join(CACHE_DIR, 'corpus', 'base.json')
+CORPUS_SYNC_DELAY = _corpus_sync_config.get('delay', 10)
+
+# ---------- 网络数据缓存（条件请求，ETag / Last-Modified / max-age） ----------
+response_cache = HttpCache(CACHE_DIR)
+image_cache = ImageCache(os.path.join(CACHE_DIR, 'images'),
+                         APP_CONFIG.get('image_cache_max_bytes', 20 * 1024 * 1024))
+# 命中缓存只改内存中的使用时间，几秒内的多次命中合并为一次写盘，在网络线程中完成
+IMAGE_INDEX_SAVE_DELAY = 5
+
+def _save_image_index(dt):
+    snapshot = image_cache.take_index()
+    if snapshot is not None:
+        net.run_in_background(image_cache.write_index, snapshot)
+
+_image_index_trigger = Clock.create_trigger(_save_image_index, IMAGE_INDEX_SAVE_DELAY)
+
+def lookup_cached_image(url):
+    """磁盘缓存中的图片路径（没有时为 None），记为最近使用"""
+    path = image_cache.lookup(url)
+    if image_cache.dirty:
+        _image_index_trigger()
+    return path
+
+def fetch_json_cached(endpoint, on_result, on_failure=None):
+    """请求 JSON 接口并缓存到 CACHE_DIR。
+    先用磁盘缓存立即回调 on_result(data, True)，再向服务器再验证；
+    缓存仍在 max-age 内则不发请求；304 不重新下载，正文有变化时再回调 on_result(data, False)。
+    请求失败时回调 on_failure(NetError)。"""
+    url = net.url(endpoint)
+    entry = response_cache.get(url)
+    cached = None
+    if entry is not None:
+        try:
+            cached = json.loads(entry.body)
+        except ValueError:
+            entry = None
+    if cached is not None:
+        on_result(cached, True)
+    if response_cache.is_fresh(entry):
+        return
+
+    def _on_response(resp):
+        if resp.status == 304:
+            # 304 Not Modified：沿用缓存正文，只刷新有效期
+            if entry is None:
+                if on_failure:
+                    on_failure(NetError('没有可再验证的缓存', 304))
+                return
+            try:
+                response_cache.revalidated(entry, resp.headers)
+            except Exception as e:
+                log.warning('刷新网络缓存失败: %s', e)
+            return
+        try:
+            response_cache.store(url, resp.body, resp.headers)
+        except Exception as e:
+            log.warning('写入网络缓存失败: %s', e)
+        if resp.data != cached:
+            on_result(resp.data, False)
+
+    # JSON 在网络线程中解析，回调经 Clock 回到界面线程
+    net.get_json(endpoint, _on_response, on_failure, headers=response_cache.conditional_headers(entry))
+
+_image_requests = {}
+
+def fetch_image_cached(url, on_path, on_failure=None):
+    """按校验值再验证远程图片；有新内容时下载到缓存，回调 on_path(本地路径)（未修改时为已缓存的路径）。
+    得不到图片（下载失败、缓存写入失败）时回调 on_failure()。
+    同一 URL 同时只有一个请求在途，其余调用者共享结果。"""
+    waiting = _image_requests.get(url)
+    if waiting is not None:
+        waiting.append((on_path, on_failure))
+        return
+    waiting = _image_requests[url] = [(on_path, on_failure)]
+    tmp_path = image_cache.temp_path(url)
+
+    def _finish(path):
+        _image_requests.pop(url, None)
+        for callback, failure in waiting:
+            if path:
+                callback(path)
+            elif failure:
+                failure()
+
+    def _discard():
+        try:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        except OSError:
+            pass
+
+    def _on_response(resp):
+        if resp.status == 304:
+            # 未修改：保留现有缓存
+            _discard()
+            _finish(lookup_cached_image(url))
+            return
+        try:
+            _finish(image_cache.commit(url, tmp_path, resp.headers))
+        except Exception as e:
+            log.warning('缓存图片 %s 失败: %s', url, e)
+            _finish(None)
+
+    def _on_failure(error):
+        _discard()
+        log.warning('下载图片 %s 失败: %s', url, error)
+        _finish(None)
+
+    net.download(url, tmp_path, _on_response, _on_failure, headers=image_cache.conditional_headers(url))
+
+# ---------- 注册字体 ----------
+# 'Chinese'：优先使用打包的子集字体（tools/build_font.py 生成，只含用到的字符），没有时退回系统字体。
+# 'ChineseFull'：完整的系统字体。Kivy 没有缺字回退，子集之外的字（用户输入、在线同步的新祝福语、
+# 服务器下发的说明）由 font_for() 换成它显示
+FONT_SUBSET_PATH = os.path.join(os.path.dirname(__file__), 'fonts', 'bless_subset.ttf')
+FONT_SUBSET_MANIFEST = os.path.splitext(FONT_SUBSET_PATH)[0] + '.json'
 system_fonts = [
     '/system/fonts/DroidSansFallback.ttf',
     '/system/fonts/NotoSansCJK-Regular.ttc',
     '/system/fonts/Roboto-Regular.ttf'
 ]
-font_registered = False
-for font_path in system_fonts:
+
+def register_font(name, candidates):
+    """注册第一个可用的字体，返回其路径（都不可用时为 ''）"""
+    for font_path in candidates:
+        try:
+            LabelBase.register(name=name, fn_regular=font_path)
+            return font_path
+        except:
+            continue
+    LabelBase.register(name=name, fn_regular='')
+    return ''
+
+def load_font_manifest():
+    """子集字体的清单：charset 为子集包含的字符，frequent 为按出现次数排序的祝福语高频字"""
     try:
-        LabelBase.register(name='Chinese', fn_regular=font_path)
-        font_registered = True
-        break
-    except:
-        continue
-if not font_registered:
-    LabelBase.register(name='Chinese', fn_regular='')
+        with open(FONT_SUBSET_MANIFEST, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+with tracer.span('注册字体'):
+    CHINESE_FONT = register_font('Chinese', [FONT_SUBSET_PATH] + system_fonts)
+    if CHINESE_FONT == FONT_SUBSET_PATH:
+        register_font('ChineseFull', system_fonts)
+        FONT_MANIFEST = load_font_manifest()
+        # 换行、制表符没有字形，但会出现在文字里
+        SUBSET_CHARS = frozenset(FONT_MANIFEST.get('charset', '')) | frozenset('\n\r\t')
+    else:
+        register_font('ChineseFull', [CHINESE_FONT])
+        FONT_MANIFEST = {}
+        SUBSET_CHARS = None  # 用的就是完整字体
+
+def font_for(text):
+    """子集字体能显示 text 时返回 'Chinese'，否则返回 'ChineseFull'"""
+    if SUBSET_CHARS is None or SUBSET_CHARS.issuperset(text):
+        return 'Chinese'
+    return 'ChineseFull'
+
+def follow_font(widget):
+    """文字可能超出子集的控件（输入框、搜索词、服务器下发的文字）：随文字内容切换字体"""
+    def update(instance, text):
+        instance.font_name = font_for(text)
+    widget.bind(text=update)
+    update(widget, widget.text)
+    return widget
+
+def frequent_glyphs():
+    """构建子集字体时统计的祝福语高频字，按出现次数排序；没有子集字体时为空"""
+    return FONT_MANIFEST.get('frequent', '')
 
 # ---------- 全局异常捕获 ----------
 def handle_exception(exc_type, exc_value, exc_traceback):
@@ -78,58 +437,211 @@ def handle_exception(exc_type, exc_value, exc_traceback):
         sys.__excepthook__(exc_type, exc_value, exc_traceback)
         return
     try:
-        private_dir = os.getenv('ANDROID_PRIVATE', '/sdcard')
-        log_path = os.path.join(private_dir, 'crash.log')
-        with open(log_path, 'a') as f:
-            f.write(''.join(traceback.format_exception(exc_type, exc_value, exc_traceback)))
+        # 同步写 LOG_DIR/crash.log：调用栈 + 崩溃前最近的日志
+        log.dump_crash(exc_type, exc_value, exc_traceback, header=APP_VERSION)
     except:
         pass
 
 sys.excepthook = handle_exception
 Window.clearcolor = get_color_from_hex('#FFF5E6')
 
-from jnius import autoclass
-PythonActivity = autoclass('org.kivy.android.PythonActivity')
-Intent = autoclass('android.content.Intent')
-Toast = autoclass('android.widget.Toast')
-String = autoclass('java.lang.String')
-Uri = autoclass('android.net.Uri')
-context = PythonActivity.mActivity
+# ---------- 平台接口（Android 上按需加载 jnius 类，电脑上只记录调用） ----------
+services = platform_services.get_services()
+show_toast = services.show_toast
+share_text = services.share_text
+open_website = services.open_website
+send_email = services.send_email
 
-def show_toast(message):
-    try:
-        Toast.makeText(context, String(message), Toast.LENGTH_SHORT).show()
-    except Exception as e:
-        print('Toast failed:', e)
+def bind_open_url(widget, url='https://www.sjinyu.com'):
+    """点击图片时打开链接（开屏轮播图、顶部广告图共用）"""
+    def on_touch_down(instance, touch):
+        try:
+            if instance.collide_point(*touch.pos):
+                open_website(url)
+        except Exception as e:
+            log.warning('打开链接异常: %s', e)
+    widget.bind(on_touch_down=on_touch_down)
+
+# ==================== 定时任务调度 ====================
+class TimerScheduler:
+    """所有定时任务统一在这里登记，按 (作用域, 名称) 管理，同名任务重新登记时替换旧任务。
+    作用域通常是页面名：页面离开、被弹窗遮挡或应用切到后台时，该作用域的任务暂停，
+    恢复可见后重新计时，不可见的界面不占用 CPU/GPU。"""
+
+    def __init__(self):
+        self._timers = {}   # (作用域, 名称) -> [回调, 间隔, 是否重复, ClockEvent 或 None]
+        self._visible = set()
+        self._holds = {}    # 作用域 -> 遮挡计数（弹窗）
+        self._paused = False
+
+    def _runnable(self, scope):
+        return not self._paused and scope in self._visible and not self._holds.get(scope)
+
+    def schedule_interval(self, scope, name, callback, period):
+        self._add(scope, name, callback, period, True)
+
+    def schedule_once(self, scope, name, callback, delay=0):
+        self._add(scope, name, callback, delay, False)
+
+    def _add(self, scope, name, callback, period, repeat):
+        self.cancel(scope, name)
+        key = (scope, name)
+        timer = self._timers[key] = [callback, period, repeat, None]
+        if self._runnable(scope):
+            self._start(key, timer)
+
+    def _start(self, key, timer):
+        callback, period, repeat, _ = timer
+        if repeat:
+            timer[3] = Clock.schedule_interval(callback, period)
+        else:
+            def fire(dt):
+                self._timers.pop(key, None)
+                callback(dt)
+            timer[3] = Clock.schedule_once(fire, period)
+
+    def _stop(self, timer):
+        if timer[3] is not None:
+            timer[3].cancel()
+            timer[3] = None
+
+    def cancel(self, scope, name):
+        timer = self._timers.pop((scope, name), None)
+        if timer:
+            self._stop(timer)
+
+    def cancel_scope(self, scope):
+        for key in [key for key in self._timers if key[0] == scope]:
+            self.cancel(*key)
+
+    def is_scheduled(self, scope, name):
+        return (scope, name) in self._timers
+
+    def _refresh(self, scope=None):
+        for key, timer in self._timers.items():
+            if scope is not None and key[0] != scope:
+                continue
+            if not self._runnable(key[0]):
+                self._stop(timer)
+            elif timer[3] is None:
+                self._start(key, timer)
 
-def share_text(text):
-    try:
-        intent = Intent()
-        intent.setAction(Intent.ACTION_SEND)
-        intent.putExtra(Intent.EXTRA_TEXT, String(text))
-        intent.setType('text/plain')
-        context.startActivity(Intent.createChooser(intent, String('分享到')))
-        return True
-    except Exception as e:
-        print('Share failed:', e)
-        return False
+    def enter(self, scope):
+        self._visible.add(scope)
+        self._refresh(scope)
 
-def open_website(url):
-    try:
-        intent = Intent()
-        intent.setAction(Intent.ACTION_VIEW)
-        intent.setData(Uri.parse(url))
-        context.startActivity(intent)
-    except Exception as e:
-        print('Open website failed:', e)
+    def leave(self, scope):
+        self._visible.discard(scope)
+        self._refresh(scope)
+
+    def hold(self, scope):
+        self._holds[scope] = self._holds.get(scope, 0) + 1
+        self._refresh(scope)
+
+    def release(self, scope):
+        self._holds[scope] = max(0, self._holds.get(scope, 0) - 1)
+        self._refresh(scope)
+
+    def pause(self):
+        self._paused = True
+        self._refresh()
+
+    def resume(self):
+        self._paused = False
+        self._refresh()
+
+    def attach_screen(self, screen):
+        """页面进入/离开时自动恢复/暂停以页面名为作用域的任务"""
+        screen.bind(on_enter=lambda s: self.enter(s.name), on_leave=lambda s: self.leave(s.name))
+
+    def cover(self, popup, scope):
+        """弹窗打开期间暂停被遮挡页面的任务"""
+        popup.bind(on_open=lambda p: self.hold(scope), on_dismiss=lambda p: self.release(scope))
+
+    @property
+    def active_count(self):
+        """正在计时的任务数（诊断用）"""
+        return sum(1 for timer in self._timers.values() if timer[3] is not None)
+
+    def __len__(self):
+        return len(self._timers)
+
+scheduler = TimerScheduler()
+
+# ==================== 轮播图预加载 ====================
+class CarouselSlide(Image):
+    """轮播图的一页，纹理由 CarouselPreloader 异步填充"""
+    def __init__(self, asset_path=None, **kwargs):
+        super().__init__(**kwargs)
+        self.asset_path = asset_path
+        self.texture_state = None  # None 未请求 / 'loading' 解码中 / 'ready' 已就绪（或失败）
+
+
+class CarouselPreloader:
+    """幻灯片先以空图占位，当前页与前后各一页在后台解码；
+    自动轮播只在下一页纹理就绪后才切换，切换时不会因解码卡顿。"""
+
+    def __init__(self, carousel, on_texture=None, **image_kwargs):
+        self.carousel = carousel
+        self.on_texture = on_texture
+        self.image_kwargs = image_kwargs
+        self._preload_trigger = Clock.create_trigger(self.preload)
+        carousel.bind(index=self.preload)
+
+    def add(self, path, position=None):
+        """添加一页；position 为在现有页中的位置，默认放在最后"""
+        slide = CarouselSlide(asset_path=path, **self.image_kwargs)
+        # Carousel.add_widget(index) 追加（index 为 0）或执行 slides.insert(index - len(slides))
+        count = len(self.carousel.slides)
+        index = 0 if position is None or position >= count else (position or count)
+        self.carousel.add_widget(slide, index)
+        self._preload_trigger()
+        return slide
+
+    def set_source(self, slide, path):
+        """替换某一页的图片（如广告图下载完成）"""
+        if slide.asset_path == path:
+            return
+        slide.asset_path = path
+        slide.texture_state = None
+        self._preload_trigger()
+
+    def _nearby(self):
+        carousel = self.carousel
+        return [s for s in (carousel.current_slide, carousel.next_slide, carousel.previous_slide)
+                if s is not None]
+
+    def preload(self, *args):
+        for slide in self._nearby():
+            self._request(slide)
+
+    def _request(self, slide):
+        path = getattr(slide, 'asset_path', None)
+        if not path or slide.texture_state is not None:
+            return
+        slide.texture_state = 'loading'
+
+        def on_texture(texture):
+            if slide.asset_path != path:
+                return
+            slide.texture_state = 'ready'
+            if texture is not None:
+                slide.texture = texture
+                if self.on_texture:
+                    self.on_texture(slide)
+
+        load_asset_texture(path, on_texture)
+
+    def load_next(self):
+        """切到下一页；下一页还在解码时跳过本次，等下个周期再切"""
+        slide = self.carousel.next_slide
+        if slide is None:
+            return
+        if not getattr(slide, 'asset_path', None) or slide.texture_state == 'ready':
+            self.carousel.load_next()
+        else:
+            self._request(slide)
 
-def send_email(recipient):
-    try:
-        intent = Intent(Intent.ACTION_SENDTO)
-        intent.setData(Uri.parse('mailto:' + recipient))
-        context.startActivity(intent)
-    except Exception as e:
-        print('Send email failed:', e)
 
 # ==================== 自定义下拉列表容器 ====================
 class CustomDropDown(DropDown):
@@ -160,88 +672,559 @@ class ChineseSpinnerOption(SpinnerOption):
 
 Spinner.option_cls = ChineseSpinnerOption
 
+# ==================== 祝福语列表行（RecycleView 复用） ====================
+ITEM_BG_COLOR = (1, 1, 1, 0.9)
+ITEM_TEXT_COLOR = (0.1, 0.1, 0.1, 1)
+ITEM_SELECTED_BG_COLOR = (0.5, 0.1, 0.1, 1)
+ITEM_SELECTED_TEXT_COLOR = (1, 1, 0, 1)
+
+ITEM_PADDING = (dp(10), dp(5))
+ITEM_FONT_SIZE = sp(15)
+# 文字纹理缓存上限（字节）；测得的行高只是数字，另外保存，不计入预算
+TEXT_TEXTURE_BUDGET = 16 * 1024 * 1024
+# 预热：每帧最多占用的时间（秒），以及每个分类预先渲染纹理的行数（其余行只测量高度）
+TEXT_WARM_FRAME_BUDGET = 0.004
+TEXT_WARM_ROWS = 6
+# 开屏时预先渲染高频字：每次渲染的字数，以及用到的字号（列表/按钮默认字号、标题字号）
+GLYPH_WARM_CHUNK = 24
+GLYPH_WARM_SIZES = (ITEM_FONT_SIZE, sp(18))
+
+class TextLayoutCache:
+    """祝福语行的文字纹理与排版高度缓存，键为 (文字, 宽度, 字体, 字号)。
+    排版参数与 Button 一致（text_size 为行宽减左右内边距，左上对齐），结果与逐行渲染相同。
+    纹理按字节预算 LRU 淘汰；高度只是数字，淘汰纹理后仍可直接排版。
+    预热在空闲帧中分片进行（纹理只能在主线程创建），每帧不超过 TEXT_WARM_FRAME_BUDGET"""
+
+    def __init__(self, max_bytes, font_name='Chinese', font_size=ITEM_FONT_SIZE, padding=ITEM_PADDING):
+        self.max_bytes = max_bytes
+        self.font_name = font_name
+        self.font_size = font_size
+        self.padding = padding
+        self._labels = OrderedDict()  # 键 -> 已渲染的 CoreLabel（GL 上下文重建时由它重新填充纹理）
+        self._heights = {}
+        self._bytes = 0
+        self._warm_jobs = deque()
+        self._glyph_jobs = deque()
+        self._warmed_glyphs = set()
+        self._warm_event = None
+
+    def _key(self, text, width):
+        return (text, int(width), self.font_name, self.font_size)
+
+    def _label(self, text, width):
+        font_name = font_for(text) if self.font_name == 'Chinese' else self.font_name
+        label = CoreLabel(text=text, font_name=font_name, font_size=self.font_size,
+                          text_size=(int(width) - 2 * self.padding[0], None),
+                          padding=(self.padding[0], self.padding[1], self.padding[0], self.padding[1]),
+                          halign='left', valign='top')
+        label.resolve_font_name()
+        return label
+
+    def height(self, text, width):
+        """文字排版后的高度（含上下内边距），只做排版不渲染"""
+        key = self._key(text, width)
+        height = self._heights.get(key)
+        if height is None:
+            height = self._heights[key] = self._label(text, width).render()[1]
+        return height
+
+    def cached_height(self, text, width):
+        """已测量过的高度，没有时返回 None（不排版）"""
+        return self._heights.get(self._key(text, width))
+
+    def texture(self, text, width):
+        key = self._key(text, width)
+        label = self._labels.get(key)
+        if label is not None:
+            self._labels.move_to_end(key)
+            return label.texture
+        label = self._label(text, width)
+        label.refresh()
+        self._labels[key] = label
+        self._heights[key] = label.texture.height
+        self._bytes += label.texture.width * label.texture.height * 4
+        while self._bytes > self.max_bytes and len(self._labels) > 1:
+            _, old = self._labels.popitem(last=False)
+            self._bytes -= old.texture.width * old.texture.height * 4
+        return label.texture
+
+    def warm(self, jobs, width):
+        """替换预热队列；jobs 为 (文字, 是否渲染纹理)"""
+        self._warm_jobs = deque((text, render, width) for text, render in jobs)
+        self._schedule_warm()
+
+    def warm_glyphs(self, chars, sizes=GLYPH_WARM_SIZES):
+        """按顺序把字逐段渲染一遍（结果丢弃），让字体文件和这些字形在首次显示列表前就已载入。
+        排在文字预热之前；已预热过的字跳过"""
+        chars = ''.join(c for c in dict.fromkeys(chars) if c not in self._warmed_glyphs)
+        self._warmed_glyphs.update(chars)
+        self._glyph_jobs.extend((chars[i:i + GLYPH_WARM_CHUNK], size)
+                                for size in sizes for i in range(0, len(chars), GLYPH_WARM_CHUNK))
+        self._schedule_warm()
+
+    def _schedule_warm(self):
+        if self._warm_event is None and (self._glyph_jobs or self._warm_jobs):
+            self._warm_event = Clock.schedule_once(self._warm_step, 0)
+
+    def _warm_step(self, dt):
+        self._warm_event = None
+        deadline = time.perf_counter() + TEXT_WARM_FRAME_BUDGET
+        glyphs, jobs = self._glyph_jobs, self._warm_jobs
+        while glyphs and time.perf_counter() < deadline:
+            chars, size = glyphs.popleft()
+            CoreLabel(text=chars, font_name=self.font_name, font_size=size).refresh()
+        while jobs and time.perf_counter() < deadline:
+            text, render, width = jobs.popleft()
+            if render:
+                self.texture(text, width)
+            else:
+                self.height(text, width)
+        self._schedule_warm()
+
+text_cache = TextLayoutCache(TEXT_TEXTURE_BUDGET)
+
+class BlessingItem(RecycleDataViewBehavior, Button):
+    """一条祝福语。只为可见区域创建，滚动时由 RecycleView 复用并重新填充数据。
+    文字纹理来自 text_cache，行被复用、切回分类或旋转回原宽度时不再重新渲染"""
+    blessing_text = StringProperty('')
+    display_text = StringProperty('')
+    selected = BooleanProperty(False)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.index = None
+        self.rv = None
+        self.background_normal = ''
+        self.background_color = ITEM_BG_COLOR
+        with self.canvas.after:
+            self._text_color = Color(*ITEM_TEXT_COLOR)
+            self._text_rect = Rectangle(size=(0, 0))
+        # 数据和尺寸都在同一帧内更新，排版完成后（下一帧之前）再取一次纹理
+        self._text_trigger = Clock.create_trigger(self._update_text, -1)
+        self.bind(display_text=self._text_trigger, width=self._text_trigger,
+                  pos=self._place_text, size=self._place_text)
+
+    def refresh_view_attrs(self, rv, index, data):
+        self.index = index
+        self.rv = rv
+        return super().refresh_view_attrs(rv, index, data)
+
+    def on_selected(self, instance, value):
+        self.background_color = ITEM_SELECTED_BG_COLOR if value else ITEM_BG_COLOR
+        self._text_color.rgba = ITEM_SELECTED_TEXT_COLOR if value else ITEM_TEXT_COLOR
+
+    def on_press(self):
+        if self.rv is not None and self.rv.on_item_press:
+            self.rv.on_item_press(self)
+
+    def _update_text(self, *args):
+        if self.get_root_window() is None:
+            # 页面还没显示（开屏期间分帧构建），此时的宽度不是真实宽度；显示后宽度变化会再触发
+            return
+        if not self.display_text or self.width <= 2 * ITEM_PADDING[0]:
+            self._text_rect.texture = None
+            self._text_rect.size = (0, 0)
+            return
+        texture = text_cache.texture(self.display_text, self.width)
+        self._text_rect.texture = texture
+        self._text_rect.size = texture.size
+        self._place_text()
+        self._update_height(texture.height)
+
+    def _place_text(self, *args):
+        # 与 Label 相同：纹理在行内居中（纹理已含内边距）
+        w, h = self._text_rect.size
+        self._text_rect.pos = (int(self.center_x - w / 2.), int(self.center_y - h / 2.))
+
+    def _update_height(self, texture_height):
+        # 列表一般已按缓存高度排好；宽度未知时生成的行在这里把真实高度写回数据
+        if self.rv is None or self.index is None or self.index >= len(self.rv.data):
+            return
+        item = self.rv.data[self.index]
+        if item.get('blessing_text') != self.blessing_text:
+            return
+        height = texture_height + dp(10)
+        if item.get('height') != height:
+            self.rv.data[self.index] = dict(item, height=height)
+
+class BlessingHint(Label):
+    """列表为空时的提示行"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.color = (1, 0, 0, 1)
+        follow_font(self)
+
+class BlessingListView(RecycleView):
+    """虚拟化祝福语列表：只渲染可见行，切换节日/分类只替换 data"""
+    def __init__(self, on_item_press=None, **kwargs):
+        super().__init__(**kwargs)
+        self.on_item_press = on_item_press
+        self.layout_manager = RecycleBoxLayout(
+            orientation='vertical',
+            size_hint_y=None,
+            spacing=dp(8),
+            default_size=(None, dp(80)),
+            default_size_hint=(1, None)
+        )
+        self.layout_manager.bind(minimum_height=self.layout_manager.setter('height'))
+        self.add_widget(self.layout_manager)
+        self.viewclass = 'BlessingItem'
+        self.key_viewclass = 'viewclass'
+        self._rows = []
+        self.bind(width=lambda *args: self._relayout_trigger())
+        self._relayout_trigger = Clock.create_trigger(self._relayout)
+
+    def _row_height(self, text, measure=True):
+        height = text_cache.height(text, self.width) if measure else text_cache.cached_height(text, self.width)
+        return None if height is None else height + dp(10)
+
+    def show_rows(self, rows, keep_position=False):
+        """rows 为 (显示文字, 祝福语)。宽度已知时首屏各行当场测量，其余行只取缓存中的高度，
+        没有的先按 default_size 排版，显示时由 BlessingItem._update_height 写回，切换开销与列表长短无关。
+        keep_position=True 时原地刷新（语料同步后）：沿用已有行的高度，保留滚动位置和选中的祝福语，
+        返回选中行的新序号（没有时为 None）"""
+        self._rows = list(rows)
+        measured = self.get_root_window() is not None and self.width > 2 * ITEM_PADDING[0]
+        # 首屏：从顶部累计到超过可见高度为止
+        remaining = (self.height or Window.height) if measured and not keep_position else 0
+        spacing = self.layout_manager.spacing
+        known, selected_text, selected_index = {}, None, None
+        if keep_position:
+            for item in self.data:
+                if 'height' in item and 'display_text' in item:
+                    known[item['display_text']] = item['height']
+                if item.get('selected'):
+                    selected_text = item['blessing_text']
+        scroll_y = self.scroll_y
+        data = []
+        for display_text, blessing_text in self._rows:
+            item = {'display_text': display_text, 'blessing_text': blessing_text, 'selected': False}
+            if selected_index is None and selected_text is not None and blessing_text == selected_text:
+                item['selected'] = True
+                selected_index = len(data)
+            if display_text in known:
+                item['height'] = known[display_text]
+            elif measured:
+                height = self._row_height(display_text, measure=remaining > 0)
+                if height is not None:
+                    item['height'] = height
+                remaining -= (height or self.layout_manager.default_size[1]) + spacing
+            data.append(item)
+        self.data = data
+        if keep_position:
+            self.scroll_y = scroll_y
+        return selected_index
+
+    def show_hint(self, text):
+        self._rows = []
+        self.data = [{'viewclass': 'BlessingHint', 'text': text, 'height': dp(80)}]
+
+    def _relayout(self, *args):
+        # 宽度变化（首次显示、旋转屏幕）：只换上新宽度下已缓存的高度，不测量；
+        # 可见行随宽度变化重新取纹理，由 _update_height 写回，其余行显示时再修正
+        if not self._rows or self.get_root_window() is None or self.width <= 2 * ITEM_PADDING[0]:
+            return
+        changed = False
+        data = []
+        for item in self.data:
+            height = self._row_height(item['display_text'], measure=False) if 'display_text' in item else None
+            if height is not None and height != item.get('height'):
+                item = dict(item, height=height)
+                changed = True
+            data.append(item)
+        if changed:
+            self.data = data
+
 # ==================== 加载祝福语数据 ====================
+def bundled_corpus_id(bundled=None):
+    """安装包自带语料的内容标识：二进制语料库头部的内容哈希，没有时为 JSON 文件的哈希"""
+    if isinstance(bundled, BlessingStore):
+        return bundled.content_hash.hex()
+    base_dir = os.path.dirname(__file__)
+    bin_path = os.path.join(base_dir, 'data', 'bless.bin')
+    try:
+        return BlessingStore.open(bin_path).content_hash.hex()
+    except Exception:
+        pass
+    try:
+        with open(os.path.join(base_dir, 'data', 'bless.json'), 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+def synced_corpus_valid(bundled):
+    """同步缓存是否基于当前的自带语料；不是时删除缓存"""
+    try:
+        with open(CORPUS_BASE_PATH, 'r', encoding='utf-8') as f:
+            base = json.load(f).get('bundled')
+    except (OSError, ValueError):
+        base = None
+    if base is not None and base == bundled_corpus_id(bundled):
+        return True
+    log.info('自带语料已更新，丢弃同步的语料缓存')
+    for path in (CORPUS_CACHE_PATH, CORPUS_BASE_PATH):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    return False
+
 def load_blessings():
     base_dir = os.path.dirname(__file__)
     json_path = os.path.join(base_dir, 'data', 'bless.json')
+    bin_path = os.path.join(base_dir, 'data', 'bless.bin')
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        if not isinstance(data, dict):
-            show_toast("数据格式错误：根节点不是字典")
+        data = None
+        if os.path.exists(bin_path):
+            # 优先使用构建时预编译的二进制语料库（mmap，按需解码）
+            try:
+                data = BlessingStore.open(bin_path)
+            except Exception as e:
+                log.warning('二进制语料库不可用，改用 JSON: %s', e)
+        if os.path.exists(CORPUS_CACHE_PATH) and synced_corpus_valid(data):
+            # 增量同步得到的语料比安装包自带的新时使用它
+            try:
+                synced = BlessingStore.open(CORPUS_CACHE_PATH)
+                if synced.revision > getattr(data, 'revision', 0):
+                    data = synced
+            except Exception as e:
+                log.warning('同步的语料库不可用: %s', e)
+        if data is None:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        if not isinstance(data, Mapping):
             return {}, "数据格式错误：根节点不是字典"
         if len(data) == 0:
-            show_toast("数据为空")
             return {}, "数据为空"
         first_festival = list(data.keys())[0]
-        if not isinstance(data[first_festival], dict):
-            show_toast(f"节日 '{first_festival}' 的数据不是字典")
+        if not isinstance(data[first_festival], Mapping):
             return {}, f"节日 '{first_festival}' 的数据不是字典"
         return data, "成功"
     except FileNotFoundError:
         err_msg = f"文件不存在: {json_path}"
-        show_toast(err_msg)
         return {}, err_msg
     except json.JSONDecodeError as e:
         err_msg = f"JSON解析错误: {e}"
-        show_toast(err_msg)
         return {}, err_msg
     except Exception as e:
         err_msg = f"未知错误: {e}"
-        show_toast(err_msg)
         return {}, err_msg
 
-ALL_BLESSINGS, load_error = load_blessings()
-
-TRADITIONAL = ['春节', '开工大吉','元宵节', '母亲节', '端午节', '父亲节','中秋节']
-PROFESSIONAL = ["女神节", '劳动节', '青年节', '护士节', '儿童节', '建党节', '建军节', '教师节', '国庆节', '记者节']
-
-FESTIVAL_DATES_2026 = {
-    '春节': (2, 17),
-    '开工大吉': (2, 24),
-    '元宵节': (3, 3),
-    '女神节': (3, 8),
-    '劳动节': (5, 1),
-    '青年节': (5, 4),
-    '护士节': (5, 12),
-    '母亲节': (5, 10),
-    '儿童节': (6, 1),
-    '端午节': (6, 19),
-    '父亲节': (6, 21),
-    '建党节': (7, 1),
-    '建军节': (8, 1),
-    '中秋节': (9, 25),
-    '教师节': (9, 10),
-    '国庆节': (10, 1),
-    '记者节': (11, 8),
-}
+# 语料库由 CorpusLoader 在后台线程加载，加载完成前为空
+ALL_BLESSINGS = {}
+load_error = '加载中'
+CORPUS_LOAD_TIMEOUT = 8
+
+class CorpusLoader(EventDispatcher):
+    """在工作线程中加载、校验语料库，完成后回到主线程派发 on_ready / on_failed；
+    检索索引随后构建，完成时派发 on_search_ready。
+    首次就绪后按 CORPUS_SYNC_DELAY 请求增量，应用成功后用新语料再派发一次 on_ready"""
+    __events__ = ('on_ready', 'on_failed', 'on_search_ready')
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.state = 'idle'  # idle / loading / ready / failed
+        self.search_index = None
+        self.facet_index = None
+        self._thread = None
+        self._syncing = False
+        self.refreshed = False  # 本次 on_ready 是否由增量同步替换语料引起
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self.state = 'loading'
+        self._thread = threading.Thread(target=self._run, name='corpus-loader', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            with tracer.span('load_blessings'):
+                data, message = load_blessings()
+        except Exception as e:
+            data, message = {}, f"未知错误: {e}"
+        facet_index = None
+        if data:
+            # 分面索引只按分类名计算，开销很小，随数据一起交付
+            try:
+                with tracer.span('FacetIndex'):
+                    facet_index = FacetIndex(data)
+            except Exception:
+                log.exception('构建分面索引失败')
+        Clock.schedule_once(lambda dt: self._finish(data, message, facet_index))
+        if not data:
+            return
+        # 数据先交给界面显示，检索索引随后在同一线程里构建
+        try:
+            with tracer.span('SearchIndex'):
+                index = SearchIndex(data)
+        except Exception:
+            log.exception('构建检索索引失败')
+            return
+        Clock.schedule_once(lambda dt: self._set_search_index(index))
+
+    def _set_search_index(self, index):
+        self.search_index = index
+        self.dispatch('on_search_ready')
+
+    def _finish(self, data, message, facet_index=None):
+        global ALL_BLESSINGS, load_error
+        load_error = message
+        if data:
+            first_load = self.state != 'ready'
+            ALL_BLESSINGS = data
+            self.facet_index = facet_index
+            self.state = 'ready'
+            self.refreshed = not first_load
+            self.dispatch('on_ready')
+            if first_load and net.urls.get('corpus_delta'):
+                Clock.schedule_once(lambda dt: self.sync(), CORPUS_SYNC_DELAY)
+        else:
+            self.state = 'failed'
+            show_toast(message)
+            self.dispatch('on_failed', message)
+
+    # ---------- 增量同步 ----------
+    def sync(self):
+        """请求当前版本之后的增量；请求只带修订号和内容哈希，响应大小与变更量成正比"""
+        if self.state != 'ready' or self._syncing:
+            return
+        self._syncing = True
+        threading.Thread(target=self._request_delta, args=(ALL_BLESSINGS,),
+                         name='corpus-sync', daemon=True).start()
+
+    def _request_delta(self, data):
+        # 解码全部语料并计算哈希（约几十毫秒），放在工作线程
+        try:
+            base = materialize(data)
+            base_hash = canonical_hash(base).hex()
+        except Exception as e:
+            log.warning('准备语料同步失败: %s', e)
+            Clock.schedule_once(lambda dt: setattr(self, '_syncing', False))
+            return
+        revision = getattr(data, 'revision', 0)
+        net.get_json('corpus_delta', lambda resp: self._on_delta(resp, base, revision),
+                     self._on_sync_failed, params={'revision': revision, 'hash': base_hash})
+
+    def _on_delta(self, resp, base, revision):
+        delta = resp.data
+        if (not isinstance(delta, dict) or not isinstance(delta.get('revision'), int)
+                or delta['revision'] <= revision):
+            self._syncing = False  # 已是最新
+            return
+        threading.Thread(target=self._apply_delta, args=(base, delta),
+                         name='corpus-sync', daemon=True).start()
+
+    def _apply_delta(self, base, delta):
+        try:
+            data = apply_delta(base, delta)
+            # 先写临时文件再原子替换；旧文件的 mmap 在替换后仍然有效
+            os.makedirs(os.path.dirname(CORPUS_CACHE_PATH), exist_ok=True)
+            compile_corpus(data, CORPUS_CACHE_PATH, delta['revision'])
+            with open(CORPUS_BASE_PATH + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump({'bundled': bundled_corpus_id()}, f)
+            os.replace(CORPUS_BASE_PATH + '.tmp', CORPUS_BASE_PATH)
+            store = BlessingStore.open(CORPUS_CACHE_PATH)
+            facet_index = FacetIndex(store)
+            index = SearchIndex(store)
+        except Exception as e:
+            log.warning('应用语料增量失败: %s', e)
+            Clock.schedule_once(lambda dt: setattr(self, '_syncing', False))
+            return
+        Clock.schedule_once(lambda dt: self._swap(store, facet_index, index))
+
+    def _swap(self, store, facet_index, index):
+        self._syncing = False
+        self.search_index = index
+        self._finish(store, "成功", facet_index)
+
+    def _on_sync_failed(self, error):
+        self._syncing = False
+        if getattr(error, 'status', None) == 404:
+            # 服务端还没有提供增量接口：不算失败，下次启动再试
+            log.debug('语料增量接口不存在: %s', error)
+            return
+        log.warning('语料同步失败: %s', error)
+
+    def on_ready(self):
+        pass
+
+    def on_failed(self, message):
+        pass
+
+    def on_search_ready(self):
+        pass
+
+corpus_loader = CorpusLoader()
+
+# 节日分组与日期都来自 festival_calendar.FESTIVALS
+TRADITIONAL = festival_calendar.festival_names(festival_calendar.TRADITIONAL)
+PROFESSIONAL = festival_calendar.festival_names(festival_calendar.PROFESSIONAL)
+
+# 分面浏览下拉框的默认文字
+FACET_HINT = '按对象浏览'
+# 搜索最多列出的条数（按相关度排序）
+SEARCH_RESULT_LIMIT = 50
+
+_festival_calendar = None
+
+def _calendar(today):
+    global _festival_calendar
+    # 预先算好今年和明年的节日表（最近的节日一定在其中），跨年后重建
+    if _festival_calendar is None or _festival_calendar.first_year != today.year:
+        _festival_calendar = festival_calendar.FestivalCalendar(today.year, today.year + 1)
+    return _festival_calendar
 
 def get_next_festival():
     """返回下一个最近节日（包括今天）的名称和天数差（0表示今天）"""
     today = datetime.now().date()
-    best = None
-    min_days = float('inf')
-    for name, (month, day) in FESTIVAL_DATES_2026.items():
-        festival_date = datetime(2026, month, day).date()
-        delta = (festival_date - today).days
-        if delta >= 0 and delta < min_days:
-            min_days = delta
-            best = name
-    # 如果所有节日都已过（2026年还有节日，但以防万一），返回春节
-    if best is None:
-        best = '春节'
-        festival_date = datetime(2026, 2, 17).date()
-        min_days = (festival_date - today).days
-    return best, min_days
+    name, _, days = _calendar(today).next_festival(today)
+    return name, days
+
+def get_following_festival(name):
+    """日历上紧接在 name（今天或之后最近的一次）之后的节日；找不到时返回 None"""
+    today = datetime.now().date()
+    calendar = _calendar(today)
+    day = today
+    while (found := calendar.next_festival(day)) is not None:
+        festival, festival_date, _ = found
+        day = festival_date + timedelta(days=1)
+        if festival == name:
+            following = calendar.next_festival(day)
+            return following[0] if following else None
+    return None
 
 # ==================== 开屏页面（本地图片加载+点击跳转） ====================
+SPLASH_IMAGES = ['images/splash0.jpg', 'images/splash1.jpg']
+FALLBACK_SPLASH_IMAGES = APP_CONFIG.get('splash_images') or ['images/splash1.png', 'images/splash2.png', 'images/splash3.png']
+
+def splash_manifest(splash_images):
+    """返回 (存在的开屏图片, 清单哈希)。哈希由路径和图片内容哈希组成（没有构建清单时用文件大小与修改时间），
+    只有列表或图片内容变化时才会改变"""
+    present = []
+    digest = hashlib.sha1()
+    for path in splash_images:
+        try:
+            stat = os.stat(resolve_image(path))
+        except OSError:
+            log.warning('开屏图片 %s 不存在', path)
+            continue
+        present.append(path)
+        key = asset_key(path)
+        if key == path:
+            key = f'{path}:{stat.st_size}:{stat.st_mtime_ns}'
+        digest.update(f'{path}={key}\n'.encode('utf-8'))
+    return present, digest.hexdigest()
+
 class StartScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        scheduler.attach_screen(self)
         layout = FloatLayout()
 
         self.carousel = Carousel(direction='right', loop=True, size_hint=(1, 1))
         self.carousel.bind(on_touch_down=self.on_carousel_touch_down)
+        self.preloader = CarouselPreloader(self.carousel, allow_stretch=True, keep_ratio=False)
         layout.add_widget(self.carousel)
 
         self.indicator_layout = BoxLayout(
@@ -251,6 +1234,7 @@ class StartScreen(Screen):
             spacing=dp(5)
         )
         self.indicators = []
+        self._active_indicator = None
         layout.add_widget(self.indicator_layout)
 
         top_right = BoxLayout(size_hint=(None, None), size=(dp(160), dp(40)),
@@ -279,32 +1263,25 @@ class StartScreen(Screen):
 
         self.add_widget(layout)
 
-        self._auto_slide_trigger = None
-        self._enter_timer = None
-        self._idle_timer = None
         self.countdown = 9
         self.total_images = 0
+        self._splash_digest = None
 
     def _start_auto_slide(self):
         self._stop_auto_slide()
         if self.total_images > 1:
-            self._auto_slide_trigger = Clock.schedule_interval(self._next_slide, 3)
+            scheduler.schedule_interval(self.name, 'auto_slide', self._next_slide, 3)
 
     def _stop_auto_slide(self):
-        if self._auto_slide_trigger:
-            self._auto_slide_trigger.cancel()
-            self._auto_slide_trigger = None
+        scheduler.cancel(self.name, 'auto_slide')
 
     def _start_enter_countdown(self):
-        self._stop_enter_countdown()
         self.countdown = 6
         self.countdown_label.text = '6 秒'
-        self._enter_timer = Clock.schedule_interval(self._tick_countdown, 1)
+        scheduler.schedule_interval(self.name, 'countdown', self._tick_countdown, 1)
 
     def _stop_enter_countdown(self):
-        if self._enter_timer:
-            self._enter_timer.cancel()
-            self._enter_timer = None
+        scheduler.cancel(self.name, 'countdown')
 
     def _tick_countdown(self, dt):
         self.countdown -= 1
@@ -315,15 +1292,12 @@ class StartScreen(Screen):
 
     def _next_slide(self, dt):
         if self.total_images > 1:
-            self.carousel.load_next()
+            self.preloader.load_next()
 
     def _reset_idle_timer(self):
-        if self._idle_timer:
-            self._idle_timer.cancel()
-        self._idle_timer = Clock.schedule_once(self._resume_after_idle, 5)
+        scheduler.schedule_once(self.name, 'idle', self._resume_after_idle, 5)
 
     def _resume_after_idle(self, dt):
-        self._idle_timer = None
         self._start_auto_slide()
         self._start_enter_countdown()
 
@@ -338,36 +1312,33 @@ class StartScreen(Screen):
         self.indicators = []
         self.indicator_layout.size = (dp(count * 30), dp(30))
         for i in range(count):
-            lbl = Label(
-                text='○',
-                font_size=sp(20),
-                color=(1,1,1,1),
+            dot = Image(
+                source=ui_image('dot_off'),
                 size_hint=(None, None),
-                size=(dp(20), dp(20)),
-                font_name='Chinese'
+                size=(dp(20), dp(20))
             )
-            self.indicators.append(lbl)
-            self.indicator_layout.add_widget(lbl)
-        if self.carousel.index < len(self.indicators):
-            self.indicators[self.carousel.index].text = '●'
+            self.indicators.append(dot)
+            self.indicator_layout.add_widget(dot)
+        self._active_indicator = None
+        self.on_carousel_index_changed(self.carousel, self.carousel.index)
 
     def on_carousel_index_changed(self, carousel, index):
-        for i, lbl in enumerate(self.indicators):
-            lbl.text = '●' if i == index else '○'
+        # 指示点是同一张图集纹理上的两个区域，切换时只改前后两个点
+        if self._active_indicator is not None and self._active_indicator < len(self.indicators):
+            self.indicators[self._active_indicator].source = ui_image('dot_off')
+        self._active_indicator = None
+        if index is not None and index < len(self.indicators):
+            self.indicators[index].source = ui_image('dot_on')
+            self._active_indicator = index
 
     def on_enter(self):
+        scheduler.cancel(self.name, 'idle')
+        text_cache.warm_glyphs(frequent_glyphs())
         self.load_splash_from_server()  # 实际已改为加载本地图片
         self._start_enter_countdown()
-        if self._idle_timer:
-            self._idle_timer.cancel()
-            self._idle_timer = None
 
     def on_leave(self):
-        self._stop_auto_slide()
-        self._stop_enter_countdown()
-        if self._idle_timer:
-            self._idle_timer.cancel()
-            self._idle_timer = None
+        scheduler.cancel_scope(self.name)
 
     def skip_to_main(self, instance):
         self.on_leave()
@@ -378,141 +1349,428 @@ class StartScreen(Screen):
 
     def load_splash_from_server(self):
         """加载本地开屏图片（两张JPG），每3秒切换，点击跳转官网"""
+        self._show_splash(*splash_manifest(SPLASH_IMAGES))
+
+    def load_fallback_splash(self):
+        """加载本地备用开屏图片（config.json 中的 splash_images，保留备用）"""
+        self._show_splash(*splash_manifest(FALLBACK_SPLASH_IMAGES))
+
+    def _show_splash(self, splash_images, digest):
+        """幻灯片在整个进程中复用，只有开屏清单哈希变化时才重建；再次进入时只回到第一页并重启计时器"""
+        if digest != self._splash_digest:
+            self._build_slides(splash_images)
+            self._splash_digest = digest
+        elif self.carousel.index:
+            self.carousel.index = 0
+        self._start_auto_slide()
+
+    def _build_slides(self, splash_images):
         self.carousel.clear_widgets()
         self.carousel.unbind(index=self.on_carousel_index_changed)
 
-        splash_images = ['images/splash0.jpg', 'images/splash1.jpg']
         for img_path in splash_images:
-            if os.path.exists(img_path):
-                try:
-                    img = Image(source=img_path, allow_stretch=True, keep_ratio=False)
-                    # 绑定点击事件，跳转到官网（可在此修改为其他链接）
-                    img.bind(on_touch_down=lambda instance, touch, path=img_path: self.on_fallback_ad_click(instance, touch))
-                    self.carousel.add_widget(img)
-                except Exception as e:
-                    print(f"加载开屏图片 {img_path} 失败: {e}")
-            else:
-                print(f"开屏图片 {img_path} 不存在")
+            # 图片在后台解码，这里只放占位页；绑定点击事件，跳转到官网（可在此修改为其他链接）
+            bind_open_url(self.preloader.add(img_path))
 
         self.total_images = len(self.carousel.slides)
         if self.total_images > 0:
             self.update_indicators(self.total_images)
-            self.carousel.bind(index=self.on_carousel_index_changed)
-            if self.total_images > 1:
-                self._start_auto_slide()
         else:
             # 如果没有图片，添加一个提示标签
             self.carousel.add_widget(Label(text='暂无开屏图片', color=(1,1,1,1)))
             self.total_images = 1
             self.update_indicators(1)
-            self.carousel.bind(index=self.on_carousel_index_changed)
+        self.carousel.bind(index=self.on_carousel_index_changed)
 
-    def load_fallback_splash(self):
-        """加载本地备用开屏图片（保留备用）"""
-        self.carousel.clear_widgets()
-        self.carousel.unbind(index=self.on_carousel_index_changed)
-        splash_images = ['images/splash1.png', 'images/splash2.png', 'images/splash3.png']
-        for img_path in splash_images:
-            if os.path.exists(img_path):
-                try:
-                    img = Image(source=img_path, allow_stretch=True, keep_ratio=False)
-                    img.bind(on_touch_down=lambda instance, touch, path=img_path: self.on_fallback_ad_click(instance, touch))
-                    self.carousel.add_widget(img)
-                except Exception as e:
-                    print(f"加载备用图片 {img_path} 失败: {e}")
 
-        self.total_images = len(self.carousel.slides)
-        if self.total_images > 0:
-            self.update_indicators(self.total_images)
-            self.carousel.bind(index=self.on_carousel_index_changed)
-            if self.total_images > 1:
-                self._start_auto_slide()
+# ==================== 弹窗模板 ====================
+def paint_background(widget, color, radius=None):
+    """给控件画跟随位置、大小变化的纯色背景（radius 不为 None 时为圆角）"""
+    with widget.canvas.before:
+        Color(*color)
+        if radius is None:
+            shape = Rectangle(pos=widget.pos, size=widget.size)
         else:
-            self.carousel.add_widget(Label(text='暂无开屏图片', color=(1,1,1,1)))
-            self.total_images = 1
-            self.update_indicators(1)
-            self.carousel.bind(index=self.on_carousel_index_changed)
+            shape = RoundedRectangle(pos=widget.pos, size=widget.size, radius=[radius])
+    widget.bind(pos=lambda instance, value: setattr(shape, 'pos', value),
+                size=lambda instance, value: setattr(shape, 'size', value))
+    return shape
+
+def wrapped_label(**kwargs):
+    """左对齐、宽度变化时自动换行的文字"""
+    options = dict(color=(0,0,0,1), halign='left', valign='middle', font_name='Chinese')
+    options.update(kwargs)
+    label = Label(**options)
+    label.bind(width=lambda instance, width: setattr(instance, 'text_size', (width, None)))
+    return label
+
+class Dialog:
+    """白色圆角弹窗：深红标题栏（标题 + 关闭按钮）加内容区 body。
+    控件树只构建一次，之后每次打开只更新文字等动态内容"""
+    width = 320
+    height = 220
+    body_padding = (dp(15), dp(10))
+    body_spacing = dp(5)
+    title_bold = False
+
+    def __init__(self):
+        self.content = BoxLayout(orientation='vertical', spacing=0, padding=0,
+                                 size_hint=(None, None), size=(dp(self.width), dp(self.height)))
+        paint_background(self.content, (1, 1, 1, 1), radius=dp(10))
 
-    def on_fallback_ad_click(self, instance, touch):
-        try:
-            if instance.collide_point(*touch.pos):
-                open_website('https://www.sjinyu.com')  # 可在此修改跳转链接
-        except Exception as e:
-            print("on_fallback_ad_click 异常:", e)
+        title_bar = BoxLayout(size_hint_y=None, height=dp(40), padding=(dp(10), 0))
+        paint_background(title_bar, (0.5, 0.1, 0.1, 1))
+        self.title_label = Label(
+            color=(1,1,1,1),
+            halign='left',
+            valign='middle',
+            size_hint_x=0.8,
+            font_name='Chinese',
+            bold=self.title_bold
+        )
+        close_btn = Button(
+            text='X',
+            size_hint=(None, None),
+            size=(dp(30), dp(30)),
+            pos_hint={'right':1, 'center_y':0.5},
+            background_normal='',
+            background_down='',
+            border=(0,0,0,0),
+            background_color=(0,0,0,0),
+            color=(1,1,1,1),
+            bold=True,
+            font_name='Chinese'
+        )
+        close_btn.bind(on_press=self.on_close)
+        title_bar.add_widget(self.title_label)
+        title_bar.add_widget(close_btn)
 
-    def on_ad_click(self, instance, touch, url):
-        try:
-            if instance.collide_point(*touch.pos):
-                open_website(url)
-        except Exception as e:
-            print("on_ad_click 异常:", e)
+        self.body = BoxLayout(orientation='vertical', padding=self.body_padding, spacing=self.body_spacing)
+        paint_background(self.body, (1, 1, 1, 1))
+        self.content.add_widget(title_bar)
+        self.content.add_widget(self.body)
+
+        self.popup = Popup(
+            title='',
+            content=self.content,
+            size_hint=(None, None),
+            size=self.content.size,
+            background_color=(0,0,0,0),
+            auto_dismiss=False
+        )
+        self.build(self.body)
+
+    def build(self, body):
+        pass
+
+    def set_height(self, height):
+        self.content.height = dp(height)
+        self.popup.size = self.content.size
+
+    def on_close(self, *args):
+        self.popup.dismiss()
+
+    def show(self):
+        self.popup.center = Window.center
+        self.popup.open()
+
+
+class ShareDialog(Dialog):
+    width = 340
+    height = 280
+    body_padding = (dp(15), dp(15), dp(15), dp(10))
+    body_spacing = dp(10)
+    title_bold = True
+
+    def build(self, body):
+        self.title_label.text = '编辑祝福语'
+        body.add_widget(wrapped_label(
+            text='可在祝福语前添加称谓，或结尾加上落款：',
+            color=(0.3,0.3,0.3,1),
+            size_hint_y=None,
+            height=dp(25)
+        ))
+        self.text_input = TextInput(
+            multiline=True,
+            size_hint_y=None,
+            height=dp(120),
+            font_name='Chinese',
+            background_color=(0.95,0.95,0.95,1),
+            foreground_color=(0,0,0,1),
+            padding=(dp(8), dp(8))
+        )
+        follow_font(self.text_input)  # 用户会在这里加上称谓、落款
+        body.add_widget(self.text_input)
+
+        button_layout = BoxLayout(size_hint_y=None, height=dp(40), spacing=dp(10))
+        cancel_btn = Button(
+            text='取消',
+            background_color=get_color_from_hex('#9E9E9E'),
+            color=(1,1,1,1),
+            font_name='Chinese'
+        )
+        share_btn = Button(
+            text='分享',
+            background_color=get_color_from_hex('#4CAF50'),
+            color=(1,1,1,1),
+            font_name='Chinese'
+        )
+        cancel_btn.bind(on_press=self.on_close)
+        share_btn.bind(on_press=self.on_share)
+        button_layout.add_widget(cancel_btn)
+        button_layout.add_widget(share_btn)
+        body.add_widget(button_layout)
+
+    def open(self, text):
+        self.text_input.text = text
+        self.text_input.cursor = (0, 0)
+        self.show()
+
+    def on_share(self, btn):
+        new_text = self.text_input.text.strip()
+        self.popup.dismiss()
+        if not new_text:
+            show_toast('内容不能为空')
+            return
+        if share_text(new_text):
+            show_toast('分享已启动')
+        else:
+            Clipboard.copy(new_text)
+            show_toast('分享失败，已复制到剪贴板')
+
+
+class AboutDialog(Dialog):
+    body_padding = (dp(20), dp(15), dp(15), dp(15))
+
+    def build(self, body):
+        self.title_label.text = '关于'
+        info_texts = [
+            '应用名称：马年送祝福',
+            '应用版本：' + APP_VERSION,
+            '应用开发：瑾 煜',
+            '反馈建议：jinyu@sjinyu.com',
+            '版权所有，侵权必究！'
+        ]
+        for line in info_texts:
+            body.add_widget(wrapped_label(text=line, size_hint_y=None, height=dp(25)))
+
+    def open(self):
+        self.show()
+
+
+class UpdateDialog(Dialog):
+    """“发现新版本”与“已是最新版”共用一个弹窗，打开时按情况调整版本行和按钮"""
+
+    def build(self, body):
+        self.latest_version = None
+        self.is_latest = False
+        self.url = None
+        self.version_label = wrapped_label(size_hint_y=None, height=dp(25))
+        self.msg_label = Label(
+            color=(0,0,0,1),
+            halign='left',
+            valign='top',
+            size_hint_y=None,
+            height=dp(80),
+            font_name='Chinese'
+        )
+        follow_font(self.msg_label)  # 更新说明来自服务器
+        self.msg_label.bind(width=lambda instance, width: setattr(instance, 'text_size', (width - dp(20), None)))
+        body.add_widget(self.msg_label)
+
+        self.button_layout = BoxLayout(size_hint_y=None, height=dp(40), spacing=dp(10), padding=(dp(10),0))
+        self.download_btn = Button(
+            text='立即下载',
+            size_hint=(0.5, 1),
+            background_color=get_color_from_hex('#4CAF50'),
+            color=(1,1,1,1),
+            font_name='Chinese'
+        )
+        self.download_btn.bind(on_press=self.on_download)
+        self.cancel_btn = Button(
+            text='以后再说',
+            size_hint=(0.5, 1),
+            background_color=get_color_from_hex('#9E9E9E'),
+            color=(1,1,1,1),
+            font_name='Chinese'
+        )
+        self.cancel_btn.bind(on_press=self.on_close)
+        self.ok_btn = Button(
+            text='确定',
+            size_hint=(1, 1),
+            background_color=get_color_from_hex('#4CAF50'),
+            color=(1,1,1,1),
+            font_name='Chinese'
+        )
+        self.ok_btn.bind(on_press=self.on_close)
+        body.add_widget(self.button_layout)
+
+    def open(self, latest_version, message, url=None, is_latest=False):
+        self.latest_version = latest_version
+        self.is_latest = is_latest
+        self.url = url
+        body = self.body
+        self.set_height(220 if is_latest else 250)
+        body.padding = (dp(10), dp(8)) if is_latest else (dp(15), dp(10))
+        self.title_label.text = "已是最新版" if is_latest else f"发现新版本 {latest_version}"
+
+        if self.version_label.parent is not None:
+            body.remove_widget(self.version_label)
+        if not is_latest:
+            self.version_label.text = f'最新版本：{latest_version}'
+            body.add_widget(self.version_label, index=len(body.children))
+        self.msg_label.text = f'更新内容：{message}'
+
+        self.button_layout.clear_widgets()
+        if not is_latest and url:
+            self.button_layout.add_widget(self.download_btn)
+            self.button_layout.add_widget(self.cancel_btn)
+        else:
+            self.button_layout.add_widget(self.ok_btn)
+        self.show()
+
+    def on_close(self, *args):
+        # 关闭或“以后再说”：同一版本不再自动提示
+        if not self.is_latest:
+            update_checker.dismiss(self.latest_version)
+        self.popup.dismiss()
+
+    def on_download(self, btn):
+        self.popup.dismiss()
+        open_website(self.url)
+
+
+class DialogFactory:
+    """按类型缓存弹窗：第一次用到（或 prebuild）时构建，之后复用同一个控件树。
+    弹窗打开期间暂停 scope 作用域的定时任务"""
+    DIALOGS = {
+        'share': ShareDialog,
+        'about': AboutDialog,
+        'update': UpdateDialog,
+    }
+
+    def __init__(self, scope):
+        self.scope = scope
+        self._dialogs = {}
+
+    def get(self, kind):
+        dialog = self._dialogs.get(kind)
+        if dialog is None:
+            with tracer.span(f'构建弹窗 {kind}'):
+                dialog = self._dialogs[kind] = self.DIALOGS[kind]()
+            scheduler.cover(dialog.popup, self.scope)
+        return dialog
+
+    def prebuild(self, *kinds):
+        for kind in kinds:
+            self.get(kind)
 
 
 # ==================== 主页面 ====================
 class MainScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        
-        # --- 调试：显示加载错误（如果有）---
-        self.error_label = None
-        if not ALL_BLESSINGS:
-            self.error_label = Label(
-                text=f"[color=ff0000]数据加载错误: {load_error}[/color]",
-                markup=True,
-                size_hint=(1, None),
-                height=dp(60),
-                color=(1,0,0,1),
-                font_name='Chinese',
-                halign='center',
-                valign='middle'
-            )
+        scheduler.attach_screen(self)
         
         festival_name, days_until = get_next_festival()
         self.current_festival = festival_name
         self.days_until = days_until
         festival_data = ALL_BLESSINGS.get(self.current_festival, {})
         self.current_category = list(festival_data.keys())[0] if festival_data else ''
-        self.selected_item = None
+        self.selected_index = None
         self.last_copied_text = None
         self.has_selected = False
         self.footer_visible = False
         self.last_scroll_y = 1
-        self._footer_timer = None
+        self._keep_list_position = False
 
         self.DEFAULT_BTN = get_color_from_hex('#CCCC99')
         self.ACTIVE_BTN = get_color_from_hex('#FFCC99')
         self.FOOTER_BG = get_color_from_hex('#333300')
+        self.browse_mode = None  # None / 'search' / 'facet'
+        self.footer = None
+        self.dialogs = DialogFactory(self.name)
+
+        self.main_layout = BoxLayout(orientation='vertical', spacing=0, padding=0)
+        self.main_layout.size_hint_y = 1
+        self.add_widget(self.main_layout)
+
+        # 界面按优先级分块，在开屏期间每帧构建一块（首帧之后才开始）；
+        # 第二项为 True 的块在进入主页面前必须完成，其余的可以在进入后继续
+        self._build_steps = [
+            (self._build_top, True),
+            (self._build_spinners, True),
+            (self._build_search, True),
+            (self._build_categories, True),
+            (self._build_list, True),
+            (self._build_bottom, True),
+            (self._build_dropdowns, False),
+            (self._build_footer, False),
+            (self._build_dialogs, False),
+        ]
+        self._build_event = Clock.schedule_once(lambda dt: self._schedule_build_step(), 0)
 
-        main_layout = BoxLayout(orientation='vertical', spacing=0, padding=0)
-        main_layout.size_hint_y = 1
-
-        # --- 如果有错误，先添加错误标签 ---
-        if self.error_label:
-            main_layout.add_widget(self.error_label)
-
+    # ---------- 分帧构建 ----------
+    def _schedule_build_step(self):
+        if self._build_steps:
+            self._build_event = Clock.schedule_once(self._run_build_step, 0)
+        else:
+            self._build_event = None
+
+    def _build_one(self):
+        step, _ = self._build_steps.pop(0)
+        with tracer.span(f'MainScreen.{step.__name__}'):
+            step()
+
+    def _run_build_step(self, dt):
+        self._build_one()
+        self._schedule_build_step()
+
+    @property
+    def is_built(self):
+        return not self._build_steps
+
+    def ensure_built(self, required_only=False):
+        """立即完成剩余的构建块；required_only=True 时只完成进入页面前必需的部分"""
+        if self._build_event is not None:
+            self._build_event.cancel()
+            self._build_event = None
+        while self._build_steps and not (required_only and not self._build_steps[0][1]):
+            self._build_one()
+        self._schedule_build_step()
+
+    def on_pre_enter(self, *args):
+        # 倒计时结束或点击跳过时，页面可见部分一定已经就绪
+        self.ensure_built(required_only=True)
+
+    def _build_top(self):
         # 顶部标题栏（图片）
         title_image = Image(
-            source='images/title.jpg',
+            source=resolve_image('images/title.jpg'),
             size_hint=(1, None),
             height=dp(80),
             allow_stretch=True,
             keep_ratio=False
         )
-        main_layout.add_widget(title_image)
+        self.main_layout.add_widget(title_image)
 
         # 顶部轮播图（高度自适应）
         self.top_carousel = Carousel(direction='right', loop=True, size_hint_y=None)
         self.top_carousel.bind(index=self.on_top_carousel_index_changed)  # 监听索引变化
-        main_layout.add_widget(self.top_carousel)
+        self.top_preloader = CarouselPreloader(self.top_carousel, on_texture=self.on_async_image_loaded,
+                                               allow_stretch=True, keep_ratio=True)
+        self._ads_batch = 0
+        self.main_layout.add_widget(self.top_carousel)
 
-        Clock.schedule_interval(lambda dt: self.top_carousel.load_next(), 3)
+        # 只在主页面可见且未被弹窗遮挡时轮播
+        scheduler.schedule_interval(self.name, 'banner', lambda dt: self.top_preloader.load_next(), 3)
         self.load_top_ads()
 
+    def _build_spinners(self):
         # 两个并排的下拉菜单
         spinner_layout = BoxLayout(size_hint=(1, None), height=dp(50), spacing=dp(5))
         self.traditional_spinner = Spinner(
             text='传统佳节',
-            values=TRADITIONAL,
             size_hint=(0.5, 1),
             background_color=self.DEFAULT_BTN,
             color=(1,1,1,1),
@@ -521,7 +1779,6 @@ class MainScreen(Screen):
         self.traditional_spinner.bind(text=self.on_traditional_spinner_select)
         self.professional_spinner = Spinner(
             text='阳历节日',
-            values=PROFESSIONAL,
             size_hint=(0.5, 1),
             background_color=self.DEFAULT_BTN,
             color=(1,1,1,1),
@@ -534,14 +1791,45 @@ class MainScreen(Screen):
 
         spinner_layout.add_widget(self.traditional_spinner)
         spinner_layout.add_widget(self.professional_spinner)
-        main_layout.add_widget(spinner_layout)
+        self.main_layout.add_widget(spinner_layout)
+        self.update_spinner_colors()
+
+    def _build_search(self):
+        # 搜索框（支持汉字和拼音首字母，跨所有节日）+ 按对象/风格跨节日浏览
+        search_layout = BoxLayout(size_hint=(1, None), height=dp(40), spacing=dp(5))
+        self.search_input = TextInput(
+            hint_text='搜索祝福语，支持拼音首字母（如 mnkl）',
+            multiline=False,
+            size_hint=(0.7, 1),
+            font_name='Chinese',
+            background_color=(1, 1, 1, 0.9),
+            foreground_color=(0.1, 0.1, 0.1, 1),
+            padding=(dp(10), dp(10))
+        )
+        follow_font(self.search_input)
+        self.search_input.bind(text=self.on_search_text)
+        self._search_trigger = Clock.create_trigger(self.run_search, 0.15)
+        corpus_loader.bind(on_search_ready=self.on_search_ready)
+        self.facet_spinner = Spinner(
+            text=FACET_HINT,
+            size_hint=(0.3, 1),
+            background_color=self.DEFAULT_BTN,
+            color=(1,1,1,1),
+            font_name='Chinese'
+        )
+        self.facet_spinner.dropdown_cls = CustomDropDown
+        self.facet_spinner.bind(text=self.on_facet_select)
+        search_layout.add_widget(self.search_input)
+        search_layout.add_widget(self.facet_spinner)
+        self.main_layout.add_widget(search_layout)
 
+    def _build_categories(self):
         # 分类切换按钮
         self.category_scroll = ScrollView(size_hint=(1, None), height=dp(50), do_scroll_x=True, do_scroll_y=False)
         self.category_layout = BoxLayout(size_hint_x=None, height=dp(50), spacing=dp(2))
         self.category_layout.bind(minimum_width=self.category_layout.setter('width'))
         self.category_scroll.add_widget(self.category_layout)
-        main_layout.add_widget(self.category_scroll)
+        self.main_layout.add_widget(self.category_scroll)
 
         # 当前节日标签
         self.current_festival_label = Label(
@@ -553,19 +1841,26 @@ class MainScreen(Screen):
             halign='center',
             bold=True
         )
-        main_layout.add_widget(self.current_festival_label)
+        follow_font(self.current_festival_label)  # 搜索时显示用户输入的关键词
+        self.main_layout.add_widget(self.current_festival_label)
+        self.update_category_buttons()
 
+    def _build_list(self):
         # 祝福语列表
-        self.scroll_view = ScrollView()
+        self.scroll_view = BlessingListView(on_item_press=self.on_copy)
         self.scroll_view.size_hint_y = 1
         self.scroll_view.bind(scroll_y=self.on_scroll)
-        self.list_layout = BoxLayout(orientation='vertical', size_hint_y=None, spacing=dp(8))
-        self.list_layout.bind(minimum_height=self.list_layout.setter('height'))
-        self.scroll_view.add_widget(self.list_layout)
-        main_layout.add_widget(self.scroll_view)
+        self.main_layout.add_widget(self.scroll_view)
+        corpus_loader.bind(on_ready=self.on_corpus_ready, on_failed=self.on_corpus_failed)
+        if corpus_loader.state == 'ready':
+            # 语料在构建完成前已就绪：补上错过的 on_ready
+            self.on_corpus_ready(corpus_loader)
+        else:
+            self.show_current_page()
 
+    def _build_bottom(self):
         # 底部区域
-        bottom_container = FloatLayout(size_hint=(1, None), height=dp(80))
+        self.bottom_container = FloatLayout(size_hint=(1, None), height=dp(80))
         
         self.share_btn = Button(
             text='通过微信/QQ/短信祝福好友',
@@ -580,20 +1875,33 @@ class MainScreen(Screen):
         )
         self.share_btn.bind(on_press=self.share_blessings)
         self.share_btn.pos = (0, 0)
-        bottom_container.add_widget(self.share_btn)
-
-        # 图标栏
-        self.footer = BoxLayout(
+        self.bottom_container.add_widget(self.share_btn)
+        self.main_layout.add_widget(self.bottom_container)
+
+    def _build_dropdowns(self):
+        # 下拉选项在设置 values 时一次性创建，开销较大，放在后面单独构建
+        self.traditional_spinner.values = TRADITIONAL
+        self.professional_spinner.values = PROFESSIONAL
+        if not self.facet_spinner.values:
+            self.facet_spinner.values = [tag for tag, _ in FACET_RULES]
+
+    def _build_dialogs(self):
+        # 分享弹窗最常用，提前构建好，点击“分享”时直接打开
+        self.dialogs.prebuild('share')
+
+    def _build_footer(self):
+        # 图标栏（初始在屏幕外，滚动列表时才滑出，所以最后构建）
+        footer = BoxLayout(
             orientation='vertical',
             size_hint=(1, None),
             height=dp(80),
             pos=(0, -dp(80))
         )
-        with self.footer.canvas.before:
+        with footer.canvas.before:
             Color(*self.FOOTER_BG)
-            self.footer_bg = Rectangle(pos=self.footer.pos, size=self.footer.size)
-        self.footer.bind(pos=lambda instance, value: setattr(self.footer_bg, 'pos', value),
-                         size=lambda instance, value: setattr(self.footer_bg, 'size', value))
+            self.footer_bg = Rectangle(pos=footer.pos, size=footer.size)
+        footer.bind(pos=lambda instance, value: setattr(self.footer_bg, 'pos', value),
+                    size=lambda instance, value: setattr(self.footer_bg, 'size', value))
 
         icon_layout = BoxLayout(
             size_hint=(None, None),
@@ -602,24 +1910,24 @@ class MainScreen(Screen):
             spacing=dp(20)
         )
         web_btn = Button(
-            background_normal='images/icon_web.png',
-            background_down='images/icon_web.png',
+            background_normal=ui_image('icon_web'),
+            background_down=ui_image('icon_web'),
             size_hint=(None, 1),
             width=dp(40),
             border=(0,0,0,0)
         )
         web_btn.bind(on_press=lambda x: open_website('https://www.sjinyu.com'))
         email_btn = Button(
-            background_normal='images/icon_email.png',
-            background_down='images/icon_email.png',
+            background_normal=ui_image('icon_email'),
+            background_down=ui_image('icon_email'),
             size_hint=(None, 1),
             width=dp(40),
             border=(0,0,0,0)
         )
         email_btn.bind(on_press=lambda x: send_email('jinyu@sjinyu.com'))
         about_btn = Button(
-            background_normal='images/icon_about.png',
-            background_down='images/icon_about.png',
+            background_normal=ui_image('icon_about'),
+            background_down=ui_image('icon_about'),
             size_hint=(None, 1),
             width=dp(40),
             border=(0,0,0,0)
@@ -640,16 +1948,10 @@ class MainScreen(Screen):
             halign='center'
         )
 
-        self.footer.add_widget(icon_layout)
-        self.footer.add_widget(copyright_label)
-        bottom_container.add_widget(self.footer)
-
-        main_layout.add_widget(bottom_container)
-
-        self.add_widget(main_layout)
-        self.update_category_buttons()
-        self.show_current_page()
-        self.update_spinner_colors()
+        footer.add_widget(icon_layout)
+        footer.add_widget(copyright_label)
+        self.bottom_container.add_widget(footer)
+        self.footer = footer
 
     def _get_festival_display_text(self):
         today_str = datetime.now().strftime("%m月%d日")
@@ -659,9 +1961,47 @@ class MainScreen(Screen):
             return f"今天是{today_str} 离“{self.current_festival}”还有{self.days_until}天"
 
     def on_enter(self, *args):
-        Clock.schedule_once(lambda dt: self.check_update(None), 1)
+        # 首帧渲染完成后再检查；间隔内不会发请求
+        if update_checker.due():
+            scheduler.schedule_once(self.name, 'check_update', lambda dt: self.check_update(None), UPDATE_CHECK_DELAY)
+        if corpus_loader.state == 'loading' and not scheduler.is_scheduled(self.name, 'corpus_timeout'):
+            scheduler.schedule_once(self.name, 'corpus_timeout', self.on_corpus_timeout, CORPUS_LOAD_TIMEOUT)
         super().on_enter(*args)
 
+    def on_corpus_ready(self, loader):
+        scheduler.cancel(self.name, 'corpus_timeout')
+        festival_data = ALL_BLESSINGS.get(self.current_festival, {})
+        # 同步替换语料时原地刷新列表，不打断正在阅读的用户；当前分类已不存在时才重新显示
+        keep = loader.refreshed and (self.browse_mode is not None or self.current_category in festival_data)
+        if self.current_category not in festival_data:
+            self.current_category = list(festival_data.keys())[0] if festival_data else ''
+        if loader.facet_index:
+            self.facet_spinner.values = loader.facet_index.tags()
+        self.update_category_buttons()
+        self._keep_list_position = keep
+        try:
+            if self.browse_mode == 'search':
+                if keep:
+                    # 同步时检索索引已随语料一起替换，直接重新搜索
+                    self.run_search()
+                else:
+                    self._search_trigger()
+            elif self.browse_mode == 'facet':
+                self.show_facet(self.facet_spinner.text)
+            else:
+                self.show_current_page()
+        finally:
+            self._keep_list_position = False
+
+    def on_corpus_failed(self, loader, message):
+        scheduler.cancel(self.name, 'corpus_timeout')
+        self.show_current_page()
+
+    def on_corpus_timeout(self, dt):
+        # 加载超时不阻塞界面：先给出提示，数据到达后 on_corpus_ready 会自动刷新
+        if corpus_loader.state == 'loading':
+            self.show_list_hint("祝福语加载较慢，请稍候…")
+
     def on_scroll(self, instance, value):
         try:
             if not self.footer:
@@ -671,35 +2011,30 @@ class MainScreen(Screen):
             elif value > self.last_scroll_y + 0.01:
                 self.show_footer_animated()
             self.last_scroll_y = value
-        except Exception as e:
-            print("on_scroll error:", e)
+        except Exception:
+            log.exception('on_scroll error')
 
     def show_footer_animated(self):
         if not self.footer or self.footer_visible:
             return
         try:
-            if self._footer_timer:
-                self._footer_timer.cancel()
-                self._footer_timer = None
             anim = Animation(y=0, duration=0.3, t='out_quad')
             anim.start(self.footer)
             self.footer_visible = True
-            self._footer_timer = Clock.schedule_once(lambda dt: self.hide_footer_animated(), 3)
-        except Exception as e:
-            print("show_footer_animated error:", e)
+            scheduler.schedule_once(self.name, 'footer', lambda dt: self.hide_footer_animated(), 3)
+        except Exception:
+            log.exception('show_footer_animated error')
 
     def hide_footer_animated(self):
         if not self.footer or not self.footer_visible:
             return
         try:
-            if self._footer_timer:
-                self._footer_timer.cancel()
-                self._footer_timer = None
+            scheduler.cancel(self.name, 'footer')
             anim = Animation(y=-dp(80), duration=0.3, t='out_quad')
             anim.start(self.footer)
             self.footer_visible = False
-        except Exception as e:
-            print("hide_footer_animated error:", e)
+        except Exception:
+            log.exception('hide_footer_animated error')
 
     def update_spinner_colors(self):
         if self.current_festival in TRADITIONAL:
@@ -713,6 +2048,7 @@ class MainScreen(Screen):
             self.professional_spinner.background_color = self.DEFAULT_BTN
 
     def on_traditional_spinner_select(self, spinner, text):
+        self.leave_browse()
         self.current_festival = text
         self.days_until = None
         self.current_festival_label.text = f"当前节日：{self.current_festival}"
@@ -723,6 +2059,7 @@ class MainScreen(Screen):
         self.update_spinner_colors()
 
     def on_professional_spinner_select(self, spinner, text):
+        self.leave_browse()
         self.current_festival = text
         self.days_until = None
         self.current_festival_label.text = f"当前节日：{self.current_festival}"
@@ -743,63 +2080,150 @@ class MainScreen(Screen):
                 width=dp(120),
                 background_color=get_color_from_hex('#DAA520' if cat == self.current_category else '#8B4513'),
                 color=(1,1,1,1),
-                font_name='Chinese'
+                font_name=font_for(cat)  # 在线同步可能带来新的分类名
             )
             btn.bind(on_press=lambda x, c=cat: self.switch_category(c))
             self.category_layout.add_widget(btn)
 
     def switch_category(self, category):
-        if category == self.current_category:
+        if self.browse_mode:
+            self.leave_browse()
+        elif category == self.current_category:
             return
         self.current_category = category
         self.update_category_buttons()
         self.show_current_page()
 
+    def on_search_text(self, instance, text):
+        self._search_trigger()
+
+    def run_search(self, *args):
+        query = self.search_input.text.strip()
+        if not query:
+            if self.browse_mode == 'search':
+                self.leave_browse()
+                self.show_current_page()
+            return
+        self.enter_browse('search')
+        index = corpus_loader.search_index
+        if index is None:
+            self.current_festival_label.text = "搜索结果"
+            # 索引构建完成后 on_search_ready 会重新执行搜索
+            self.show_list_hint("正在准备搜索，请稍候…" if corpus_loader.state != 'failed' else f"数据加载错误: {load_error}")
+            return
+        results = index.search(query, SEARCH_RESULT_LIMIT)
+        # 结果达到上限时实际命中可能更多，只说明显示的是前若干条
+        count = f"前 {SEARCH_RESULT_LIMIT} 条" if len(results) >= SEARCH_RESULT_LIMIT else f"{len(results)} 条"
+        self.current_festival_label.text = f"搜索“{query}”：{count}"
+        if not results:
+            self.show_list_hint("没有找到相关祝福语")
+            return
+        self.show_source_rows((r.text, r.festival, r.category) for r in results)
+
+    def on_search_ready(self, loader):
+        if self.browse_mode == 'search':
+            self._search_trigger()
+
+    def on_facet_select(self, spinner, tag):
+        if tag == FACET_HINT:
+            return
+        self.enter_browse('facet')
+        self.show_facet(tag)
+
+    def show_facet(self, tag):
+        """跨节日列出某个对象/风格标签下的全部祝福语"""
+        index = corpus_loader.facet_index
+        if index is None:
+            self.current_festival_label.text = f"「{tag}」相关祝福"
+            self.show_list_hint("正在加载祝福语…" if corpus_loader.state != 'failed' else f"数据加载错误: {load_error}")
+            return
+        self.current_festival_label.text = f"「{tag}」相关祝福：{index.count(tag)} 条（跨节日）"
+        if not index.count(tag):
+            self.show_list_hint("该类别暂无祝福语")
+            return
+        self.show_source_rows((text, festival, category) for festival, category, _, text in index.entries(tag))
+
+    def show_source_rows(self, rows):
+        """列出来自不同节日/分类的祝福语，行尾注明出处；复制的仍是祝福语本身"""
+        self.show_rows((f"{text}\n—— {festival} · {category}", text) for text, festival, category in rows)
+
+    def show_rows(self, rows):
+        """显示列表并回到顶部；语料同步后原地刷新时保留滚动位置和选中行"""
+        if self._keep_list_position:
+            self.selected_index = self.scroll_view.show_rows(rows, keep_position=True)
+            return
+        self.selected_index = None
+        self.scroll_view.show_rows(rows)
+        self.scroll_view.scroll_y = 1
+
+    def enter_browse(self, mode):
+        """进入搜索/分面浏览模式（首次进入时记住节日标签，便于退出时恢复）"""
+        if not self.browse_mode:
+            self._festival_label_text = self.current_festival_label.text
+        self.browse_mode = mode
+        self.selected_index = None
+        if mode != 'search' and self.search_input.text:
+            self.search_input.text = ''
+        if mode != 'facet':
+            self.facet_spinner.text = FACET_HINT
+
+    def leave_browse(self):
+        """退出搜索/分面浏览模式，恢复节日标签（列表由调用方刷新）"""
+        if not self.browse_mode:
+            return
+        self.browse_mode = None
+        self._search_trigger.cancel()
+        self.current_festival_label.text = self._festival_label_text
+        if self.search_input.text:
+            self.search_input.text = ''
+        self.facet_spinner.text = FACET_HINT
+
     def show_current_page(self):
-        self.list_layout.clear_widgets()
+        if corpus_loader.state == 'loading':
+            self.show_list_hint("正在加载祝福语…")
+            return
+        if corpus_loader.state == 'failed':
+            self.show_list_hint(f"数据加载错误: {load_error}")
+            return
         festival_data = ALL_BLESSINGS.get(self.current_festival, {})
         if not festival_data:
-            hint = Label(
-                text="该节日暂无数据或数据格式错误",
-                size_hint_y=None,
-                height=dp(80),
-                color=(1,0,0,1),
-                font_name='Chinese'
-            )
-            self.list_layout.add_widget(hint)
+            self.show_list_hint("该节日暂无数据或数据格式错误")
             return
         blessings = festival_data.get(self.current_category, [])
         if not blessings:
-            hint = Label(
-                text="该分类暂无祝福语",
-                size_hint_y=None,
-                height=dp(80),
-                color=(1,0,0,1),
-                font_name='Chinese'
-            )
-            self.list_layout.add_widget(hint)
+            self.show_list_hint("该分类暂无祝福语")
             return
-        for text in blessings:
-            btn = Button(
-                text=text,
-                size_hint_y=None,
-                height=dp(80),
-                background_normal='',
-                background_color=(1, 1, 1, 0.9),
-                color=(0.1, 0.1, 0.1, 1),
-                halign='left',
-                valign='top',
-                padding=(dp(10), dp(5)),
-                font_name='Chinese'
-            )
-            btn.bind(
-                width=lambda *x, b=btn: b.setter('text_size')(b, (b.width - dp(20), None)),
-                texture_size=lambda *x, b=btn: setattr(b, 'height', b.texture_size[1] + dp(10))
-            )
-            btn.bind(on_press=self.on_copy)
-            btn.blessing_text = text
-            btn.default_bg_color = (1, 1, 1, 0.9)
-            self.list_layout.add_widget(btn)
+        self.show_rows((text, text) for text in blessings)
+        self.warm_text_cache()
+
+    def warm_text_cache(self):
+        """在空闲帧里预热当前节日的各分类和接下来可能打开的节日：正在看即将到来的节日时是日历上的
+        下一个节日，否则是即将到来的节日（回到默认页）。每个分类前 TEXT_WARM_ROWS 行渲染纹理，
+        其余行只测量高度。当前分类排在最前，开屏期间构建好的列表第一次显示时直接用缓存"""
+        # 页面还没显示时列表宽度不是真实宽度；列表横向占满窗口，按窗口宽度预热
+        width = self.scroll_view.width if self.scroll_view.get_root_window() else Window.width
+        if width <= 2 * ITEM_PADDING[0]:
+            return
+        upcoming, _ = get_next_festival()
+        following = upcoming if upcoming != self.current_festival else get_following_festival(upcoming)
+        targets = [self.current_festival]
+        if following in ALL_BLESSINGS and following != self.current_festival:
+            targets.append(following)
+        jobs = []
+        current = ALL_BLESSINGS.get(self.current_festival, {}).get(self.current_category, [])
+        jobs.extend((text, i < TEXT_WARM_ROWS) for i, text in enumerate(current))
+        for festival in targets:
+            for category, blessings in ALL_BLESSINGS.get(festival, {}).items():
+                if festival == self.current_festival and category == self.current_category:
+                    continue
+                jobs.extend((text, i < TEXT_WARM_ROWS) for i, text in enumerate(blessings))
+        # 先渲染各分类的首屏，再测量其余行
+        jobs.sort(key=lambda job: not job[1])
+        text_cache.warm(jobs, width)
+
+    def show_list_hint(self, text):
+        self.selected_index = None
+        self.scroll_view.show_hint(text)
 
     def on_copy(self, instance):
         try:
@@ -812,393 +2236,52 @@ class MainScreen(Screen):
                 show_toast('祝福语已复制')
             except:
                 pass
-            if self.selected_item and self.selected_item != instance:
-                self.selected_item.background_color = (1, 1, 1, 0.9)
-                self.selected_item.color = (0.1, 0.1, 0.1, 1)
-            instance.background_color = (0.5, 0.1, 0.1, 1)
-            instance.color = (1, 1, 0, 1)
-            self.selected_item = instance
+            data = self.scroll_view.data
+            if self.selected_index is not None and self.selected_index != instance.index \
+                    and self.selected_index < len(data):
+                data[self.selected_index] = dict(data[self.selected_index], selected=False)
+            data[instance.index] = dict(data[instance.index], selected=True)
+            self.selected_index = instance.index
             if not self.has_selected:
                 self.has_selected = True
                 self.share_btn.background_color = get_color_from_hex('#4CAF50')
                 self.share_btn.disabled = False
-        except Exception as e:
-            print("on_copy 发生异常:", e)
+        except Exception:
+            log.exception('on_copy 发生异常')
 
     def share_blessings(self, instance):
         if not self.last_copied_text:
             show_toast('请先选择一条祝福')
             return
-
-        content = BoxLayout(orientation='vertical', spacing=0, padding=0,
-                            size_hint=(None, None), size=(dp(340), dp(280)))
-        with content.canvas.before:
-            Color(1, 1, 1, 1)
-            self.popup_bg = RoundedRectangle(pos=content.pos, size=content.size, radius=[dp(10)])
-        content.bind(pos=lambda *x: setattr(self.popup_bg, 'pos', content.pos),
-                     size=lambda *x: setattr(self.popup_bg, 'size', content.size))
-
-        title_bar = BoxLayout(size_hint_y=None, height=dp(40), padding=(dp(10), 0))
-        with title_bar.canvas.before:
-            Color(0.5, 0.1, 0.1, 1)
-            self.popup_title_rect = Rectangle(pos=title_bar.pos, size=title_bar.size)
-        title_bar.bind(pos=lambda *x: setattr(self.popup_title_rect, 'pos', title_bar.pos),
-                       size=lambda *x: setattr(self.popup_title_rect, 'size', title_bar.size))
-
-        title_label = Label(
-            text='编辑祝福语',
-            color=(1,1,1,1),
-            halign='left',
-            valign='middle',
-            size_hint_x=0.8,
-            font_name='Chinese',
-            bold=True
-        )
-        close_btn = Button(
-            text='X',
-            size_hint=(None, None),
-            size=(dp(30), dp(30)),
-            pos_hint={'right':1, 'center_y':0.5},
-            background_normal='',
-            background_down='',
-            border=(0,0,0,0),
-            background_color=(0,0,0,0),
-            color=(1,1,1,1),
-            bold=True,
-            font_name='Chinese'
-        )
-        close_btn.bind(on_press=lambda x: popup.dismiss())
-        title_bar.add_widget(title_label)
-        title_bar.add_widget(close_btn)
-
-        content_area = BoxLayout(orientation='vertical', padding=(dp(15), dp(15), dp(15), dp(10)), spacing=dp(10))
-        with content_area.canvas.before:
-            Color(1, 1, 1, 1)
-            self.popup_content_rect = Rectangle(pos=content_area.pos, size=content_area.size)
-        content_area.bind(pos=lambda *x: setattr(self.popup_content_rect, 'pos', content_area.pos),
-                          size=lambda *x: setattr(self.popup_content_rect, 'size', content_area.size))
-
-        hint_label = Label(
-            text='可在祝福语前添加称谓，或结尾加上落款：',
-            color=(0.3,0.3,0.3,1),
-            size_hint_y=None,
-            height=dp(25),
-            font_name='Chinese',
-            halign='left',
-            valign='middle'
-        )
-        hint_label.bind(width=lambda *x: setattr(hint_label, 'text_size', (hint_label.width, None)))
-        content_area.add_widget(hint_label)
-
-        text_input = TextInput(
-            text=self.last_copied_text,
-            multiline=True,
-            size_hint_y=None,
-            height=dp(120),
-            font_name='Chinese',
-            background_color=(0.95,0.95,0.95,1),
-            foreground_color=(0,0,0,1),
-            padding=(dp(8), dp(8))
-        )
-        content_area.add_widget(text_input)
-
-        button_layout = BoxLayout(size_hint_y=None, height=dp(40), spacing=dp(10))
-        cancel_btn = Button(
-            text='取消',
-            background_color=get_color_from_hex('#9E9E9E'),
-            color=(1,1,1,1),
-            font_name='Chinese'
-        )
-        share_btn = Button(
-            text='分享',
-            background_color=get_color_from_hex('#4CAF50'),
-            color=(1,1,1,1),
-            font_name='Chinese'
-        )
-        button_layout.add_widget(cancel_btn)
-        button_layout.add_widget(share_btn)
-        content_area.add_widget(button_layout)
-
-        content.add_widget(title_bar)
-        content.add_widget(content_area)
-
-        popup = Popup(
-            title='',
-            content=content,
-            size_hint=(None, None),
-            size=content.size,
-            background_color=(0,0,0,0),
-            auto_dismiss=False
-        )
-        popup.center = Window.center
-
-        def on_share(btn):
-            new_text = text_input.text.strip()
-            popup.dismiss()
-            if not new_text:
-                show_toast('内容不能为空')
-                return
-            if share_text(new_text):
-                show_toast('分享已启动')
-            else:
-                Clipboard.copy(new_text)
-                show_toast('分享失败，已复制到剪贴板')
-
-        share_btn.bind(on_press=on_share)
-        cancel_btn.bind(on_press=popup.dismiss)
-
-        popup.open()
+        self.dialogs.get('share').open(self.last_copied_text)
 
     def show_about_popup(self, instance):
-        content = BoxLayout(orientation='vertical', spacing=0, padding=0,
-                            size_hint=(None, None), size=(dp(320), dp(220)))
-        with content.canvas.before:
-            Color(1, 1, 1, 1)
-            self.bg_rect = RoundedRectangle(pos=content.pos, size=content.size, radius=[dp(10)])
-        content.bind(pos=lambda *x: setattr(self.bg_rect, 'pos', content.pos),
-                     size=lambda *x: setattr(self.bg_rect, 'size', content.size))
-
-        title_bar = BoxLayout(size_hint_y=None, height=dp(40), padding=(dp(10), 0))
-        with title_bar.canvas.before:
-            Color(0.5, 0.1, 0.1, 1)
-            self.title_rect = Rectangle(pos=title_bar.pos, size=title_bar.size)
-        title_bar.bind(pos=lambda *x: setattr(self.title_rect, 'pos', title_bar.pos),
-                       size=lambda *x: setattr(self.title_rect, 'size', title_bar.size))
-
-        title_label = Label(
-            text='关于',
-            color=(1,1,1,1),
-            halign='left',
-            valign='middle',
-            size_hint_x=0.8,
-            font_name='Chinese'
-        )
-        close_btn = Button(
-            text='X',
-            size_hint=(None, None),
-            size=(dp(30), dp(30)),
-            pos_hint={'right':1, 'center_y':0.5},
-            background_normal='',
-            background_down='',
-            border=(0,0,0,0),
-            background_color=(0,0,0,0),
-            color=(1,1,1,1),
-            bold=True,
-            font_name='Chinese'
-        )
-        close_btn.bind(on_press=lambda x: popup.dismiss())
-        title_bar.add_widget(title_label)
-        title_bar.add_widget(close_btn)
-
-        content_area = BoxLayout(orientation='vertical', padding=(dp(20), dp(15), dp(15), dp(15)), spacing=dp(5))
-        with content_area.canvas.before:
-            Color(1, 1, 1, 1)
-            self.content_rect = Rectangle(pos=content_area.pos, size=content_area.size)
-        content_area.bind(pos=lambda *x: setattr(self.content_rect, 'pos', content_area.pos),
-                          size=lambda *x: setattr(self.content_rect, 'size', content_area.size))
-
-        info_texts = [
-            '应用名称：马年送祝福',
-            '应用版本：' + APP_VERSION,
-            '应用开发：瑾 煜',
-            '反馈建议：jinyu@sjinyu.com',
-            '版权所有，侵权必究！'
-        ]
-        for line in info_texts:
-            lbl = Label(
-                text=line,
-                color=(0,0,0,1),
-                halign='left',
-                valign='middle',
-                size_hint_y=None,
-                height=dp(25),
-                font_name='Chinese'
-            )
-            lbl.bind(width=lambda *x, l=lbl: setattr(l, 'text_size', (l.width, None)))
-            content_area.add_widget(lbl)
-
-        content.add_widget(title_bar)
-        content.add_widget(content_area)
-
-        popup = Popup(
-            title='',
-            content=content,
-            size_hint=(None, None),
-            size=content.size,
-            background_color=(0,0,0,0),
-            auto_dismiss=False
-        )
-        popup.open()
-
-    def parse_version(self, version_str):
-        if version_str.startswith('v'):
-            version_str = version_str[1:]
-        parts = version_str.split('.')
-        return [int(p) for p in parts]
-
-    def is_newer_version(self, latest, current):
-        return self.parse_version(latest) > self.parse_version(current)
+        self.dialogs.get('about').open()
 
     def check_update(self, instance):
-        url = 'https://www.sjinyu.com/tools/bless/data/update.json'
+        """instance 为 None 时是进入主页面后的自动检查：受检查间隔限制，失败不提示"""
+        manual = instance is not None
 
-        def on_success(req, result):
+        def on_update(info):
             try:
-                if isinstance(result, str):
-                    result = json.loads(result)
-                latest_version = result.get('version', '未知版本')
-                message = result.get('message', '无更新说明')
-                download_url = result.get('url', None)
-
-                if self.is_newer_version(latest_version, APP_VERSION):
-                    self.show_update_popup(latest_version, message, download_url, is_latest=False)
+                self.show_update_popup(info.get('version') or '未知版本', info.get('message') or '无更新说明',
+                                       info.get('url'), is_latest=False)
             except Exception as e:
                 show_toast('解析更新信息失败')
-                print('Update parse error:', e)
-
-        def on_failure(req, result):
-            show_toast('检查更新失败，请稍后重试')
-            print('Update request failed:', result)
+                log.warning('Update parse error: %s', e)
 
-        def on_error(req, error):
-            show_toast('网络连接错误')
-            print('Update request error:', error)
+        def on_failure(error):
+            if manual:
+                if error.status is None:
+                    show_toast('网络连接错误')
+                else:
+                    show_toast('检查更新失败，请稍后重试')
+            log.warning('Update request failed: %s', error)
 
-        UrlRequest(url, on_success=on_success, on_failure=on_failure, on_error=on_error)
+        update_checker.check(on_update, on_failure, force=manual)
 
     def show_update_popup(self, latest_version, message, url=None, is_latest=False):
-        from kivy.uix.boxlayout import BoxLayout
-        from kivy.uix.button import Button
-        from kivy.uix.label import Label
-        from kivy.uix.popup import Popup
-        from kivy.graphics import Color, RoundedRectangle, Rectangle
-
-        popup_height = 220 if is_latest else 250
-        content = BoxLayout(orientation='vertical', spacing=0, padding=0,
-                            size_hint=(None, None), size=(dp(320), dp(popup_height)))
-        with content.canvas.before:
-            Color(1, 1, 1, 1)
-            self.popup_bg = RoundedRectangle(pos=content.pos, size=content.size, radius=[dp(10)])
-        content.bind(pos=lambda *x: setattr(self.popup_bg, 'pos', content.pos),
-                     size=lambda *x: setattr(self.popup_bg, 'size', content.size))
-
-        title_bar = BoxLayout(size_hint_y=None, height=dp(40), padding=(dp(10), 0))
-        with title_bar.canvas.before:
-            Color(0.5, 0.1, 0.1, 1)
-            self.popup_title_rect = Rectangle(pos=title_bar.pos, size=title_bar.size)
-        title_bar.bind(pos=lambda *x: setattr(self.popup_title_rect, 'pos', title_bar.pos),
-                       size=lambda *x: setattr(self.popup_title_rect, 'size', title_bar.size))
-
-        if is_latest:
-            title_text = "已是最新版"
-        else:
-            title_text = f"发现新版本 {latest_version}"
-
-        title_label = Label(
-            text=title_text,
-            color=(1,1,1,1),
-            halign='left',
-            valign='middle',
-            size_hint_x=0.8,
-            font_name='Chinese'
-        )
-        close_btn = Button(
-            text='X',
-            size_hint=(None, None),
-            size=(dp(30), dp(30)),
-            pos_hint={'right':1, 'center_y':0.5},
-            background_normal='',
-            background_down='',
-            border=(0,0,0,0),
-            background_color=(0,0,0,0),
-            color=(1,1,1,1),
-            bold=True,
-            font_name='Chinese'
-        )
-        close_btn.bind(on_press=lambda x: popup.dismiss())
-        title_bar.add_widget(title_label)
-        title_bar.add_widget(close_btn)
-
-        content_area_padding = (dp(10), dp(8)) if is_latest else (dp(15), dp(10))
-        content_area = BoxLayout(orientation='vertical', padding=content_area_padding, spacing=dp(5))
-        with content_area.canvas.before:
-            Color(1, 1, 1, 1)
-            self.popup_content_rect = Rectangle(pos=content_area.pos, size=content_area.size)
-        content_area.bind(pos=lambda *x: setattr(self.popup_content_rect, 'pos', content_area.pos),
-                          size=lambda *x: setattr(self.popup_content_rect, 'size', content_area.size))
-
-        if not is_latest:
-            version_label = Label(
-                text=f'最新版本：{latest_version}',
-                color=(0,0,0,1),
-                halign='left',
-                valign='middle',
-                size_hint_y=None,
-                height=dp(25),
-                font_name='Chinese'
-            )
-            version_label.bind(width=lambda *x, l=version_label: setattr(l, 'text_size', (l.width, None)))
-            content_area.add_widget(version_label)
-
-        msg_label = Label(
-            text=f'更新内容：{message}',
-            color=(0,0,0,1),
-            halign='left',
-            valign='top',
-            size_hint_y=None,
-            height=dp(80),
-            text_size=(content_area.width - dp(20), None),
-            font_name='Chinese'
-        )
-        msg_label.bind(width=lambda *x, l=msg_label: setattr(l, 'text_size', (l.width - dp(20), None)))
-        content_area.add_widget(msg_label)
-
-        button_layout = BoxLayout(size_hint_y=None, height=dp(40), spacing=dp(10), padding=(dp(10),0))
-        
-        if not is_latest and url:
-            download_btn = Button(
-                text='立即下载',
-                size_hint=(0.5, 1),
-                background_color=get_color_from_hex('#4CAF50'),
-                color=(1,1,1,1),
-                font_name='Chinese'
-            )
-            download_btn.bind(on_press=lambda x: (popup.dismiss(), open_website(url)))
-            button_layout.add_widget(download_btn)
-            cancel_btn = Button(
-                text='以后再说',
-                size_hint=(0.5, 1),
-                background_color=get_color_from_hex('#9E9E9E'),
-                color=(1,1,1,1),
-                font_name='Chinese'
-            )
-            cancel_btn.bind(on_press=lambda x: popup.dismiss())
-            button_layout.add_widget(cancel_btn)
-        else:
-            ok_btn = Button(
-                text='确定',
-                size_hint=(1, 1),
-                background_color=get_color_from_hex('#4CAF50'),
-                color=(1,1,1,1),
-                font_name='Chinese'
-            )
-            ok_btn.bind(on_press=lambda x: popup.dismiss())
-            button_layout.add_widget(ok_btn)
-
-        content_area.add_widget(button_layout)
-
-        content.add_widget(title_bar)
-        content.add_widget(content_area)
-
-        popup = Popup(
-            title='',
-            content=content,
-            size_hint=(None, None),
-            size=content.size,
-            background_color=(0,0,0,0),
-            auto_dismiss=False
-        )
-        popup.open()
+        self.dialogs.get('update').open(latest_version, message, url, is_latest)
 
     # ==================== 顶部轮播图高度自适应相关方法 ====================
     def on_top_carousel_index_changed(self, carousel, index):
@@ -1218,52 +2301,84 @@ class MainScreen(Screen):
             Animation(height=new_height, duration=0.2, t='out_quad').start(self.top_carousel)
 
     def load_top_ads(self):
-        url = 'https://www.sjinyu.com/tools/bless/data/ads.json'
-        
-        def on_success(req, result):
+        def on_result(result, from_cache):
             try:
-                if isinstance(result, str):
-                    result = json.loads(result)
-                ads_list = result.get('ads', [])
-                active_ads = [ad for ad in ads_list if ad.get('active') is True]
-                active_ads.sort(key=lambda ad: ad.get('display_order', 999))
-                self.top_carousel.clear_widgets()
-                for ad in active_ads:
-                    img_url = ad.get('image_url')
-                    link_url = ad.get('redirect_url')
-                    if img_url:
-                        try:
-                            # 使用 AsyncImage，保持比例，加载完成后自动调整高度
-                            img = AsyncImage(source=img_url, allow_stretch=True, keep_ratio=True)
-                            img.bind(on_load=self.on_async_image_loaded)  # 监听加载完成
-                            if link_url:
-                                img.bind(on_touch_down=lambda instance, touch, url=link_url: self.on_ad_click(instance, touch, url))
-                            self.top_carousel.add_widget(img)
-                        except Exception as e:
-                            print(f"加载网络图片 {img_url} 失败: {e}")
-                if not active_ads:
-                    self.load_fallback_ads()
-                # 如果至少有一张图片，手动触发一次高度调整（针对第一张）
-                if self.top_carousel.slides:
-                    first_img = self.top_carousel.slides[0]
-                    if first_img.texture:
-                        self.adjust_carousel_height(first_img)
+                self.show_top_ads(result)
             except Exception as e:
-                print('解析广告数据失败:', e)
-                self.load_fallback_ads()
-        
-        def on_failure(req, result):
-            print('广告请求失败:', result)
-            self.load_fallback_ads()
+                log.warning('解析广告数据失败: %s', e)
+                if not self._ads_shown:
+                    self.load_fallback_ads()
         
-        def on_error(req, error):
-            print('广告请求错误:', error)
-            self.load_fallback_ads()
+        def on_failure(error):
+            log.warning('广告请求失败: %s', error)
+            if not self._ads_shown:
+                self.load_fallback_ads()
         
+        # 有缓存时先用缓存渲染轮播图，网络结果有变化时再刷新
+        self._ads_shown = False
         try:
-            UrlRequest(url, on_success=on_success, on_failure=on_failure, on_error=on_error)
-        except Exception as e:
-            print('UrlRequest 异常:', e)
+            fetch_json_cached('ads', on_result, on_failure=on_failure)
+        except Exception:
+            log.exception('广告请求异常')
+            if not self._ads_shown:
+                self.load_fallback_ads()
+
+    def show_top_ads(self, result):
+        ads_list = result.get('ads', [])
+        active_ads = [ad for ad in ads_list if ad.get('active') is True]
+        active_ads.sort(key=lambda ad: ad.get('display_order', 999))
+        self.top_carousel.clear_widgets()
+        # 上一次显示时还在下载的图片，回调按批次作废
+        self._ads_batch += 1
+        self._ad_orders = []  # 已加入轮播的广告序号，与轮播页顺序一致
+        self._ads_pending = 0
+        for order, ad in enumerate(active_ads):
+            img_url = ad.get('image_url')
+            if img_url:
+                try:
+                    self._show_ad(self._ads_batch, order, img_url, ad.get('redirect_url'))
+                except Exception as e:
+                    log.warning('加载网络图片 %s 失败: %s', img_url, e)
+        self._ads_shown = True
+        self._check_ads_empty()
+
+    def _show_ad(self, batch, order, img_url, link_url):
+        # 磁盘缓存中有图片时直接解码显示，再在后台按校验值再验证；
+        # 没有时下载成功后才按顺序插入轮播，不会出现空白页
+        cached = lookup_cached_image(img_url)
+        slide = self._add_ad_slide(order, cached, link_url) if cached else None
+        if slide is None:
+            self._ads_pending += 1
+
+        def on_path(path):
+            nonlocal slide
+            if batch != self._ads_batch:
+                return
+            if slide is not None:
+                self.top_preloader.set_source(slide, path)
+                return
+            slide = self._add_ad_slide(order, path, link_url)
+            self._ads_pending -= 1
+
+        def on_failure():
+            if batch != self._ads_batch or slide is not None:
+                return
+            self._ads_pending -= 1
+            self._check_ads_empty()
+
+        fetch_image_cached(img_url, on_path, on_failure)
+
+    def _add_ad_slide(self, order, path, link_url):
+        position = bisect.bisect(self._ad_orders, order)
+        self._ad_orders.insert(position, order)
+        slide = self.top_preloader.add(path, position)
+        if link_url:
+            bind_open_url(slide, link_url)
+        return slide
+
+    def _check_ads_empty(self):
+        """没有可显示的广告图（或全部下载失败）时显示备用图"""
+        if not self._ad_orders and not self._ads_pending:
             self.load_fallback_ads()
 
     def on_async_image_loaded(self, instance):
@@ -1276,81 +2391,65 @@ class MainScreen(Screen):
         self.top_carousel.clear_widgets()
         for i in range(1, 6):
             img_path = f'images/top{i:02d}.jpg'
-            if not os.path.exists(img_path):
-                print(f"备用图片 {img_path} 不存在，已跳过")
+            if not os.path.exists(resolve_image(img_path)):
+                log.warning('备用图片 %s 不存在，已跳过', img_path)
                 continue
-            try:
-                img = Image(source=img_path, allow_stretch=True, keep_ratio=True)
-                # 如果图片已加载，直接调整高度；否则等待加载
-                if img.texture:
-                    # 如果是当前显示的图片，调整高度
-                    if img == self.top_carousel.current_slide:
-                        self.adjust_carousel_height(img)
-                else:
-                    img.bind(on_load=self.on_async_image_loaded)  # 同样监听加载事件
-                img.bind(on_touch_down=lambda instance, touch, path=img_path: self.on_fallback_ad_click(instance, touch))
-                self.top_carousel.add_widget(img)
-            except Exception as e:
-                print(f"加载备用图片 {img_path} 失败: {e}")
-
-        # 如果至少有一张图片，尝试调整高度
-        if self.top_carousel.slides:
-            first_img = self.top_carousel.slides[0]
-            if first_img.texture:
-                self.adjust_carousel_height(first_img)
-
-    def on_fallback_ad_click(self, instance, touch):
-        try:
-            if instance.collide_point(*touch.pos):
-                open_website('https://www.sjinyu.com')
-        except Exception as e:
-            print("on_fallback_ad_click 异常:", e)
-
-    def on_ad_click(self, instance, touch, url):
-        try:
-            if instance.collide_point(*touch.pos):
-                open_website(url)
-        except Exception as e:
-            print("on_ad_click 异常:", e)
+            # 内容相同的备用图共用一份纹理，后台解码完成后再调整高度
+            bind_open_url(self.top_preloader.add(img_path))
 
 
 class BlessApp(App):
     def build(self):
+        build_started = tracer.now()
+        corpus_loader.start()
         Window.borderless = True
         Window.fullscreen = True
         Window.size = Window.system_size
         sm = ScreenManager()
-        sm.add_widget(StartScreen(name='start'))
-        sm.add_widget(MainScreen(name='main'))
+        with tracer.span('StartScreen.__init__'):
+            sm.add_widget(StartScreen(name='start'))
+        with tracer.span('MainScreen.__init__'):
+            sm.add_widget(MainScreen(name='main'))
         
         try:
-            self._set_immersive_mode()
+            services.set_immersive_mode()
         except Exception as e:
-            print('Failed to set immersive mode:', e)
+            log.warning('Failed to set immersive mode: %s', e)
         
+        tracer.complete('BlessApp.build', build_started)
+        if tracer.enabled:
+            self._trace_first_frame(tracer.now())
         return sm
-    
-    def _set_immersive_mode(self):
-        from jnius import autoclass
-        PythonActivity = autoclass('org.kivy.android.PythonActivity')
-        View = autoclass('android.view.View')
-        WindowManager = autoclass('android.view.WindowManager$LayoutParams')
-        
-        activity = PythonActivity.mActivity
-        decor_view = activity.getWindow().getDecorView()
-        
-        ui_options = (View.SYSTEM_UI_FLAG_LAYOUT_STABLE
-                      | View.SYSTEM_UI_FLAG_LAYOUT_HIDE_NAVIGATION
-                      | View.SYSTEM_UI_FLAG_LAYOUT_FULLSCREEN
-                      | View.SYSTEM_UI_FLAG_HIDE_NAVIGATION
-                      | View.SYSTEM_UI_FLAG_FULLSCREEN
-                      | View.SYSTEM_UI_FLAG_IMMERSIVE_STICKY)
-        decor_view.setSystemUiVisibility(ui_options)
-        
-        lp = activity.getWindow().getAttributes()
-        lp.layoutInDisplayCutoutMode = WindowManager.LAYOUT_IN_DISPLAY_CUTOUT_MODE_SHORT_EDGES
-        activity.getWindow().setAttributes(lp)
 
+    def _trace_first_frame(self, build_finished):
+        def on_flip(*args):
+            Window.unbind(on_flip=on_flip)
+            tracer.complete('首帧', build_finished)
+            Clock.schedule_once(self._write_startup_trace, STARTUP_TRACE_FLUSH_DELAY)
+        Window.bind(on_flip=on_flip)
+
+    def _write_startup_trace(self, dt):
+        try:
+            if tracer.write(STARTUP_TRACE_PATH):
+                log.info('启动追踪已写入: %s', STARTUP_TRACE_PATH)
+        except Exception as e:
+            log.warning('写入启动追踪失败: %s', e)
+
+    def on_pause(self):
+        # 切到后台时暂停所有定时任务；进程可能在后台被回收，先写回图片缓存索引
+        scheduler.pause()
+        image_cache.flush()
+        return True
+
+    def on_resume(self):
+        scheduler.resume()
+
+    def on_stop(self):
+        image_cache.flush()
+        log.flush()
+
+
+tracer.complete('main.py 模块', _module_started)
 
 if __name__ == '__main__':
     BlessApp().run()
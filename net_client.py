@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+net_client.py - 统一的网络请求客户端
+- 接口地址来自 config.json 的 urls，调用方用名称（如 'ads'、'update'）请求
+- 相同的请求（URL、请求头、处理方式都相同）在途时只发一次，结果分发给所有调用者
+- 每个接口可单独设置超时；连接错误、超时和 5xx 按带抖动的指数退避重试
+- 请求带 Accept-Encoding: gzip，响应在工作线程中解压、解析 JSON 或写入文件
+- 回调通过 dispatch（主程序里是 Kivy Clock）回到界面线程执行
+- observer（可选）在每个请求结束时于网络线程中调用 observer(url, 开始时间, Response 或 NetError)，
+  开始时间取自 time.perf_counter()，用于耗时统计
+
+本模块不依赖 Kivy。
+"""
+
+import os
+import gzip
+import json
+import time
+import random
+import threading
+import urllib.request
+import urllib.error
+import urllib.parse
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+Response = namedtuple('Response', 'url status headers body data')
+
+
+class NetError(Exception):
+    """请求最终失败。status 为 HTTP 状态码，网络不通或超时时为 None"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class _RetryableError(Exception):
+    pass
+
+
+class NetClient:
+    def __init__(self, urls, dispatch=None, timeout=10, timeouts=None,
+                 max_retries=2, backoff=1.0, max_backoff=30, max_workers=4, observer=None):
+        self.urls = dict(urls)
+        self.dispatch = dispatch or (lambda fn: fn())
+        self.timeout = timeout
+        self.timeouts = dict(timeouts or {})
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.observer = observer
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='net')
+        self._lock = threading.Lock()
+        self._inflight = {}
+
+    def url(self, endpoint):
+        """接口名称对应的地址；传入完整 URL 时原样返回"""
+        if '://' in endpoint:
+            return endpoint
+        try:
+            return self.urls[endpoint]
+        except KeyError:
+            raise KeyError(f'config.json 中没有配置接口: {endpoint}') from None
+
+    def _timeout(self, endpoint):
+        return self.timeouts.get(endpoint, self.timeout)
+
+    def pending(self):
+        """在途（去重后）的请求数"""
+        with self._lock:
+            return len(self._inflight)
+
+    def request(self, endpoint, on_success, on_failure=None, headers=None, parse_json=False, file_path=None,
+                params=None):
+        """发起 GET 请求，params 为附加的查询参数。
+        成功（含 304）时回调 on_success(Response)，parse_json=True 时 Response.data 为解析结果；
+        指定 file_path 时正文写入该文件而不是放在 Response.body 中。
+        重试用尽后回调 on_failure(NetError)。"""
+        url = self.url(endpoint)
+        if params:
+            url += ('&' if '?' in url else '?') + urllib.parse.urlencode(params)
+        headers = dict(headers or {})
+        key = (url, tuple(sorted(headers.items())), parse_json, file_path)
+        with self._lock:
+            waiters = self._inflight.get(key)
+            if waiters is not None:
+                waiters.append((on_success, on_failure))
+                return
+            self._inflight[key] = [(on_success, on_failure)]
+        self._pool.submit(self._run, key, url, headers, parse_json, file_path, self._timeout(endpoint))
+
+    def run_in_background(self, fn, *args):
+        """在网络线程池中执行与请求无关的小任务（如写缓存索引），不回调"""
+        self._pool.submit(fn, *args)
+
+    def get_json(self, endpoint, on_success, on_failure=None, headers=None, params=None):
+        self.request(endpoint, on_success, on_failure, headers=headers, parse_json=True, params=params)
+
+    def download(self, endpoint, file_path, on_success, on_failure=None, headers=None):
+        self.request(endpoint, on_success, on_failure, headers=headers, file_path=file_path)
+
+    def _run(self, key, url, headers, parse_json, file_path, timeout):
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                response = self._fetch(url, headers, parse_json, file_path, timeout)
+                error = None
+                break
+            except _RetryableError as e:
+                error = e.args[0]
+            except NetError as e:
+                error = e
+                break
+            except Exception as e:
+                error = NetError(str(e))
+                break
+            if attempt >= self.max_retries:
+                break
+            # 指数退避 + 抖动，避免大量客户端同时重试
+            delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+            time.sleep(delay * random.uniform(0.5, 1.5))
+            attempt += 1
+
+        if self.observer is not None:
+            try:
+                self.observer(url, started, response if error is None else error)
+            except Exception:
+                pass
+        with self._lock:
+            waiters = self._inflight.pop(key, [])
+        if error is None:
+            for on_success, _ in waiters:
+                self.dispatch(lambda cb=on_success: cb(response))
+        else:
+            for _, on_failure in waiters:
+                if on_failure:
+                    self.dispatch(lambda cb=on_failure: cb(error))
+
+    def _fetch(self, url, headers, parse_json, file_path, timeout):
+        req_headers = dict(headers)
+        if file_path is None:
+            req_headers.setdefault('Accept-Encoding', 'gzip')
+        req = urllib.request.Request(url, headers=req_headers)
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                status = resp.status
+                resp_headers = dict(resp.headers.items())
+                encoding = (resp.headers.get('Content-Encoding') or '').lower()
+                if file_path is not None:
+                    self._save(resp, file_path)
+                    return Response(url, status, resp_headers, None, None)
+                body = resp.read()
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return Response(url, 304, dict(e.headers.items()), None, None)
+            if e.code >= 500 or e.code == 429:
+                raise _RetryableError(NetError(f'HTTP {e.code}', e.code))
+            raise NetError(f'HTTP {e.code}', e.code)
+        except (urllib.error.URLError, OSError) as e:
+            raise _RetryableError(NetError(str(getattr(e, 'reason', e))))
+
+        if encoding == 'gzip':
+            body = gzip.decompress(body)
+        data = None
+        if parse_json:
+            try:
+                data = json.loads(body.decode('utf-8'))
+            except ValueError as e:
+                raise NetError(f'JSON解析错误: {e}', status)
+        return Response(url, status, resp_headers, body, data)
+
+    def _save(self, resp, file_path):
+        tmp_path = file_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            while True:
+                chunk = resp.read(64 * 1024)
+                if not chunk:
+                    break
+                f.write(chunk)
+        os.replace(tmp_path, file_path)
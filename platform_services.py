@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+platform_services.py - 平台接口（提示、分享、打开网页、发邮件、沉浸模式）
+- AndroidServices：通过 jnius 调用 Android API。jnius 在第一次调用时才导入，
+  每个 Java 类只在第一次用到时 autoclass 一次并缓存，启动阶段不做 JNI 反射
+- DesktopServices：Linux / Windows / macOS 上运行时使用，只把调用写进日志，便于在电脑上
+  调试和做性能分析
+
+get_services() 按运行环境返回其中之一。本模块不依赖 Kivy。
+"""
+
+import os
+from collections import deque
+
+from app_log import log
+
+
+class AndroidServices:
+    name = 'android'
+
+    def __init__(self):
+        self._classes = {}
+        self._activity = None
+
+    def _class(self, name):
+        cls = self._classes.get(name)
+        if cls is None:
+            from jnius import autoclass
+            cls = self._classes[name] = autoclass(name)
+        return cls
+
+    @property
+    def activity(self):
+        if self._activity is None:
+            self._activity = self._class('org.kivy.android.PythonActivity').mActivity
+        return self._activity
+
+    def show_toast(self, message):
+        try:
+            Toast = self._class('android.widget.Toast')
+            String = self._class('java.lang.String')
+            Toast.makeText(self.activity, String(message), Toast.LENGTH_SHORT).show()
+        except Exception as e:
+            log.warning('Toast failed: %s', e)
+
+    def share_text(self, text):
+        try:
+            Intent = self._class('android.content.Intent')
+            String = self._class('java.lang.String')
+            intent = Intent()
+            intent.setAction(Intent.ACTION_SEND)
+            intent.putExtra(Intent.EXTRA_TEXT, String(text))
+            intent.setType('text/plain')
+            self.activity.startActivity(Intent.createChooser(intent, String('分享到')))
+            return True
+        except Exception as e:
+            log.warning('Share failed: %s', e)
+            return False
+
+    def open_website(self, url):
+        try:
+            Intent = self._class('android.content.Intent')
+            intent = Intent()
+            intent.setAction(Intent.ACTION_VIEW)
+            intent.setData(self._class('android.net.Uri').parse(url))
+            self.activity.startActivity(intent)
+        except Exception as e:
+            log.warning('Open website failed: %s', e)
+
+    def send_email(self, recipient):
+        try:
+            Intent = self._class('android.content.Intent')
+            intent = Intent(Intent.ACTION_SENDTO)
+            intent.setData(self._class('android.net.Uri').parse('mailto:' + recipient))
+            self.activity.startActivity(intent)
+        except Exception as e:
+            log.warning('Send email failed: %s', e)
+
+    def set_immersive_mode(self):
+        """隐藏状态栏和导航栏（下滑时临时显示），内容延伸到刘海区域"""
+        View = self._class('android.view.View')
+        WindowManager = self._class('android.view.WindowManager$LayoutParams')
+        window = self.activity.getWindow()
+        decor_view = window.getDecorView()
+
+        ui_options = (View.SYSTEM_UI_FLAG_LAYOUT_STABLE
+                      | View.SYSTEM_UI_FLAG_LAYOUT_HIDE_NAVIGATION
+                      | View.SYSTEM_UI_FLAG_LAYOUT_FULLSCREEN
+                      | View.SYSTEM_UI_FLAG_HIDE_NAVIGATION
+                      | View.SYSTEM_UI_FLAG_FULLSCREEN
+                      | View.SYSTEM_UI_FLAG_IMMERSIVE_STICKY)
+        decor_view.setSystemUiVisibility(ui_options)
+
+        lp = window.getAttributes()
+        lp.layoutInDisplayCutoutMode = WindowManager.LAYOUT_IN_DISPLAY_CUTOUT_MODE_SHORT_EDGES
+        window.setAttributes(lp)
+
+
+class DesktopServices:
+    """电脑上运行时的替身：不调用任何系统功能，只记录调用"""
+    name = 'desktop'
+
+    def __init__(self):
+        self.calls = deque(maxlen=100)  # 最近的调用，调试用
+
+    def _log(self, method, *args):
+        self.calls.append((method, args))
+        log.info('[平台接口] %s%s', method, args)
+
+    def show_toast(self, message):
+        self._log('show_toast', message)
+
+    def share_text(self, text):
+        self._log('share_text', text)
+        return True
+
+    def open_website(self, url):
+        self._log('open_website', url)
+
+    def send_email(self, recipient):
+        self._log('send_email', recipient)
+
+    def set_immersive_mode(self):
+        self._log('set_immersive_mode')
+
+
+def is_android():
+    # python-for-android 启动时设置 ANDROID_ARGUMENT
+    return 'ANDROID_ARGUMENT' in os.environ
+
+
+def get_services():
+    return AndroidServices() if is_android() else DesktopServices()
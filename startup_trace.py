@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+startup_trace.py - 启动阶段耗时记录
+把模块导入、字体注册、语料加载、各页面构建、首帧、首个网络响应等阶段记录为
+Chrome trace 事件（ph='X'），写成 JSON 后可直接在 chrome://tracing 或 Perfetto
+（ui.perfetto.dev）中打开。不同线程的阶段显示在各自的轨道上。
+
+配置未读取之前先缓存事件；configure(False) 之后所有接口立即返回，
+span() 返回共享的空上下文，不分配对象、不记时间。
+
+本模块不依赖 Kivy。
+"""
+
+import os
+import json
+import time
+import threading
+import contextlib
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class _Span:
+    __slots__ = ('tracer', 'name', 'cat', 'args', 'start')
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tracer.complete(self.name, self.start, cat=self.cat, **self.args)
+        return False
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = True
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._events = []
+        self._threads = {}
+
+    def configure(self, enabled):
+        """读取配置后调用；关闭时丢弃已缓存的事件，此后不再记录"""
+        if not enabled:
+            self.enabled = False
+            self._events = []
+
+    def now(self):
+        return time.perf_counter()
+
+    def _us(self, t):
+        return round((t - self._origin) * 1e6, 1)
+
+    def _tid(self):
+        thread = threading.current_thread()
+        self._threads.setdefault(thread.ident, thread.name)
+        return thread.ident
+
+    def span(self, name, cat='startup', **args):
+        """with tracer.span('阶段名'): ..."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    def complete(self, name, start, end=None, cat='startup', **args):
+        """记录从 start 到 end（默认为现在）的阶段，时间取自 now()"""
+        if not self.enabled:
+            return
+        end = self.now() if end is None else end
+        self._events.append({
+            'name': name, 'cat': cat, 'ph': 'X',
+            'ts': self._us(start), 'dur': round((end - start) * 1e6, 1),
+            'pid': self._pid, 'tid': self._tid(), 'args': args,
+        })
+
+    def instant(self, name, cat='startup', **args):
+        if not self.enabled:
+            return
+        self._events.append({
+            'name': name, 'cat': cat, 'ph': 'i', 's': 'p',
+            'ts': self._us(self.now()), 'pid': self._pid, 'tid': self._tid(), 'args': args,
+        })
+
+    def write(self, path):
+        """写出 trace 文件（先写临时文件再原子替换）并停止记录，返回是否写出"""
+        if not self.enabled:
+            return False
+        self.enabled = False
+        metadata = [{'name': 'thread_name', 'ph': 'M', 'pid': self._pid, 'tid': tid, 'args': {'name': name}}
+                    for tid, name in self._threads.items()]
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': metadata + self._events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self._events = []
+        return True
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+benchmark.py - 无界面性能基准
+在 Linux 上用离屏 Kivy 窗口运行 main.py 的热点路径，结果写成 JSON，便于不同版本对比：
+- cold_import：新进程中 import main 的耗时（子进程，每次都是冷启动）
+- load_blessings：加载语料库
+- main_screen_init：MainScreen 构造函数（首帧前的部分）
+- main_screen_build：构造并完成全部分帧构建块
+- show_current_page：逐个节日、分类刷新列表
+- spinner_switch：通过两个下拉框切换节日
+- share_popup_open：打开分享弹窗
+- carousel_slide：顶部轮播图换页
+除冷启动和语料加载外，每次计时都包含操作之后渲染的一帧（布局、绘制在下一帧发生）。
+
+平台接口使用 platform_services.DesktopServices（只把调用写进日志），网络请求指向本机不可达的地址，
+界面走和断网时相同的回退路径，结果不受网络影响。
+
+用法：
+  python tools/benchmark.py [-o results.json] [--repeat N] [--import-repeat N]
+  python tools/benchmark.py --compare old.json new.json [--threshold 0.2]
+需要能创建 SDL2 离屏窗口的 Kivy（与应用相同的版本）。
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+import subprocess
+import contextlib
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OFFLINE_URL = 'http://127.0.0.1:9/'
+WINDOW_SIZE = (400, 800)
+
+
+# ==================== 运行环境 ====================
+def prepare_environment():
+    """离屏窗口、安静的日志"""
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+    os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+    os.environ.setdefault('SDL_VIDEODRIVER', 'offscreen')
+    os.chdir(ROOT_DIR)
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+
+
+def summarize(samples):
+    samples_ms = [s * 1000 for s in samples]
+    return {
+        'unit': 'ms',
+        'n': len(samples_ms),
+        'min': round(min(samples_ms), 3),
+        'median': round(statistics.median(samples_ms), 3),
+        'mean': round(statistics.fmean(samples_ms), 3),
+        'max': round(max(samples_ms), 3),
+    }
+
+
+# ==================== 冷启动 ====================
+def probe_import():
+    """子进程入口：只计 import main 的耗时"""
+    prepare_environment()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(sys.stderr):
+        import main
+        seconds = time.perf_counter() - start
+        # 日志由后台线程输出，重定向结束前写完，免得混进结果
+        main.log.flush()
+    print(json.dumps({'seconds': seconds}))
+
+
+def bench_cold_import(repeat):
+    samples = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), '--import-probe'],
+                             cwd=ROOT_DIR, capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(out.strip().splitlines()[-1])['seconds'])
+    return summarize(samples)
+
+
+# ==================== 进程内基准 ====================
+class Bench:
+    def __init__(self, repeat):
+        self.repeat = repeat
+        self.results = {}
+
+        from kivy.base import EventLoop
+        from kivy.clock import Clock
+        import main
+        self.main = main
+        self.Clock = Clock
+        self.EventLoop = EventLoop
+
+        # 离线：所有接口指向不可达地址且不重试，走断网回退路径
+        main.net.urls = {name: OFFLINE_URL for name in main.net.urls if name != 'corpus_delta'}
+        main.net.max_retries = 0
+        # 日志只写文件，不在后台线程里打印到标准输出
+        main.log.console = False
+
+    def frame(self):
+        self.Clock.tick()
+        self.EventLoop.window.dispatch('on_draw')
+        self.EventLoop.window.dispatch('on_flip')
+
+    def settle(self, frames=10):
+        for _ in range(frames):
+            self.frame()
+
+    def measure(self, name, op, repeat=None, frame=True):
+        """执行 op（以及其后的一帧）repeat 次；op 接收序号，便于轮换参数"""
+        samples = []
+        for i in range(repeat or self.repeat):
+            start = time.perf_counter()
+            op(i)
+            if frame:
+                self.frame()
+            samples.append(time.perf_counter() - start)
+        self.results[name] = summarize(samples)
+
+    def run(self):
+        main = self.main
+        from kivy.core.window import Window
+        from kivy.uix.screenmanager import ScreenManager
+        from blessing_index import FacetIndex
+        Window.size = WINDOW_SIZE
+
+        self.measure('load_blessings', lambda i: main.load_blessings(), frame=False)
+        data, message = main.load_blessings()
+        if not data:
+            raise RuntimeError(f'语料库加载失败: {message}')
+        self.corpus_source = 'bin' if isinstance(data, main.BlessingStore) else 'json'
+        main.corpus_loader._finish(data, message, FacetIndex(data))
+
+        screens = []
+
+        def init_screen(i):
+            screens.append(main.MainScreen(name=f'bench_init{i}'))
+
+        def build_screen(i):
+            screens.append(main.MainScreen(name=f'bench_build{i}'))
+            screens[-1].ensure_built()
+        self.measure('main_screen_init', init_screen, frame=False)
+        self.measure('main_screen_build', build_screen)
+        for screen in screens:
+            screen.ensure_built()
+            main.scheduler.cancel_scope(screen.name)
+
+        sm = ScreenManager()
+        screen = main.MainScreen(name='main')
+        screen.ensure_built()
+        sm.add_widget(screen)
+        Window.add_widget(sm)
+        self.settle()
+
+        pages = [(festival, category) for festival, festival_data in main.ALL_BLESSINGS.items()
+                 for category in festival_data]
+
+        def show_page(i):
+            screen.current_festival, screen.current_category = pages[i]
+            screen.show_current_page()
+        self.measure('show_current_page', show_page, repeat=len(pages))
+
+        switches = ([(screen.on_traditional_spinner_select, screen.traditional_spinner, name)
+                     for name in main.TRADITIONAL]
+                    + [(screen.on_professional_spinner_select, screen.professional_spinner, name)
+                       for name in main.PROFESSIONAL])
+        def switch_festival(i):
+            on_select, spinner, name = switches[i % len(switches)]
+            on_select(spinner, name)
+        self.measure('spinner_switch', switch_festival, repeat=max(self.repeat, len(switches)))
+
+        festival, category = pages[0]
+        screen.last_copied_text = main.ALL_BLESSINGS[festival][category][0]
+        samples = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            screen.share_blessings(None)
+            self.frame()
+            samples.append(time.perf_counter() - start)
+            for popup in [w for w in Window.children if isinstance(w, main.Popup)]:
+                popup.dismiss(animation=False)
+            self.settle(2)
+        self.results['share_popup_open'] = summarize(samples)
+
+        carousel = screen.top_carousel
+        self.settle(20)
+        slides = len(carousel.slides)
+        if slides > 1:
+            def change_slide(i):
+                carousel.index = (carousel.index + 1) % slides
+            self.measure('carousel_slide', change_slide)
+
+        Window.remove_widget(sm)
+        return self.results
+
+
+def environment_info():
+    import kivy
+    import main
+    return {
+        'app_version': main.APP_VERSION,
+        'python': platform.python_version(),
+        'kivy': kivy.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+# ==================== 结果对比 ====================
+def compare(old_path, new_path, threshold):
+    """按中位数对比两份结果，变慢超过 threshold 的项返回非零"""
+    with open(old_path, 'r', encoding='utf-8') as f:
+        old = json.load(f)
+    with open(new_path, 'r', encoding='utf-8') as f:
+        new = json.load(f)
+    regressions = 0
+    print(f"{'benchmark':<20}{'old ms':>12}{'new ms':>12}{'change':>10}")
+    for name, result in new['results'].items():
+        before = old['results'].get(name)
+        if not before:
+            print(f'{name:<20}{"-":>12}{result["median"]:>12.3f}{"new":>10}')
+            continue
+        change = result['median'] / before['median'] - 1 if before['median'] else 0.0
+        flag = ''
+        if change > threshold:
+            flag = '  <-- 变慢'
+            regressions += 1
+        print(f'{name:<20}{before["median"]:>12.3f}{result["median"]:>12.3f}{change:>+10.1%}{flag}')
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='无界面运行应用热点路径并输出 JSON 基准结果')
+    parser.add_argument('-o', '--output', help='结果文件，默认输出到标准输出')
+    parser.add_argument('--repeat', type=int, default=20, help='每项重复次数')
+    parser.add_argument('--import-repeat', type=int, default=3, help='冷启动测量次数（每次一个子进程）')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='对比两份结果')
+    parser.add_argument('--threshold', type=float, default=0.2, help='中位数变慢超过该比例视为回退')
+    parser.add_argument('--import-probe', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.import_probe:
+        return probe_import()
+    if args.compare:
+        return compare(*args.compare, args.threshold)
+
+    cold_import = bench_cold_import(args.import_repeat)
+    prepare_environment()
+    # 应用自身的 print 输出不混进 JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        bench = Bench(args.repeat)
+        results = {'cold_import': cold_import, **bench.run()}
+        report = {**environment_info(), 'corpus_source': bench.corpus_source,
+                  'repeat': args.repeat, 'results': results}
+
+    text = json.dumps(report, ensure_ascii=False, indent=1)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
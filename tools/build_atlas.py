@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+build_atlas.py - 构建时生成界面小图标图集
+把底部图标、轮播指示点和 bless.png 按各屏幕密度缩放后打包进一张纹理，输出
+images/dist/<密度>/ui.atlas + ui-0.png（Kivy atlas 格式），并生成
+images/dist/atlas.json 供运行时按 dpi 选择。界面通过 atlas://.../ui/<名称> 引用区域，
+这些图标共用一张纹理。
+
+用法：python tools/build_atlas.py [--src images] [--out images/dist]
+需要 Pillow（仅构建机需要）；不依赖 Kivy，atlas 文件格式与 kivy.atlas 生成的一致。
+"""
+
+import os
+import sys
+import json
+import argparse
+
+from PIL import Image
+
+from build_images import DENSITIES, SOURCE_SCALE
+
+ATLAS_NAME = 'ui'
+ATLAS_IMAGES = (
+    'icon_web.png', 'icon_email.png', 'icon_about.png', 'icon_help.png', 'icon_update.png',
+    'dot_on.png', 'dot_off.png', 'bless.png',
+)
+MAX_WIDTH = 1024
+PADDING = 2
+
+
+def _next_pow2(n):
+    size = 1
+    while size < n:
+        size *= 2
+    return size
+
+
+def pack(sizes, max_width=MAX_WIDTH, padding=PADDING):
+    """按高度从大到小逐行摆放，返回 ({序号: (x, y)}, 图集宽, 图集高)，y 以顶部为原点"""
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    positions = {}
+    x = y = shelf_h = used_w = 0
+    for i in order:
+        w, h = sizes[i]
+        if x and x + w + padding > max_width:
+            y += shelf_h + padding
+            x = shelf_h = 0
+        positions[i] = (x, y)
+        x += w + padding
+        used_w = max(used_w, x)
+        shelf_h = max(shelf_h, h)
+    return positions, _next_pow2(used_w), _next_pow2(y + shelf_h)
+
+
+def build_density(src_dir, out_dir, density, scale):
+    factor = scale / SOURCE_SCALE
+    images = []
+    for name in ATLAS_IMAGES:
+        with Image.open(os.path.join(src_dir, name)) as im:
+            im = im.convert('RGBA')
+            size = (max(1, round(im.width * factor)), max(1, round(im.height * factor)))
+            if size != im.size:
+                im = im.resize(size, Image.LANCZOS)
+            images.append((os.path.splitext(name)[0], im))
+
+    positions, width, height = pack([im.size for _, im in images])
+    sheet = Image.new('RGBA', (width, height))
+    regions = {}
+    for i, (uid, im) in enumerate(images):
+        x, y = positions[i]
+        sheet.paste(im, (x, y))
+        # Kivy 的纹理坐标以左下角为原点
+        regions[uid] = [x, height - y - im.height, im.width, im.height]
+
+    target_dir = os.path.join(out_dir, density)
+    os.makedirs(target_dir, exist_ok=True)
+    sheet_name = f'{ATLAS_NAME}-0.png'
+    sheet.save(os.path.join(target_dir, sheet_name + '.tmp'), 'PNG', optimize=True)
+    os.replace(os.path.join(target_dir, sheet_name + '.tmp'), os.path.join(target_dir, sheet_name))
+    atlas_path = os.path.join(target_dir, ATLAS_NAME + '.atlas')
+    with open(atlas_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({sheet_name: regions}, f)
+    os.replace(atlas_path + '.tmp', atlas_path)
+    return atlas_path, (width, height)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='把界面小图标打包成按密度区分的纹理图集')
+    parser.add_argument('--src', default='images')
+    parser.add_argument('--out', default=os.path.join('images', 'dist'))
+    args = parser.parse_args(argv)
+
+    atlases = {}
+    for density, scale in DENSITIES:
+        atlas_path, size = build_density(args.src, args.out, density, scale)
+        atlases[density] = atlas_path.replace(os.sep, '/')
+        print(f'{atlases[density]}: {size[0]}x{size[1]}')
+
+    manifest_path = os.path.join(args.out, 'atlas.json')
+    with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({
+            'densities': dict(DENSITIES),
+            'atlases': atlases,
+            'regions': [os.path.splitext(name)[0] for name in ATLAS_IMAGES],
+        }, f, ensure_ascii=False, indent=1)
+    os.replace(manifest_path + '.tmp', manifest_path)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+build_font.py - 构建时中文字体子集化
+从一个完整的中文字体（如 Noto Sans SC、思源黑体）中只保留应用用到的字符，输出
+fonts/bless_subset.ttf，随 APK 打包，运行时优先注册它，不再打开几 MB ~ 几十 MB 的系统字体。
+
+保留的字符：
+- data/bless.json 中的全部文字（节日名、分类名、祝福语）
+- main.py、festival_calendar.py、blessing_index.py 中的全部字符串常量（界面文字、节日名、
+  分面标签，含 f-string 的固定部分）
+- config.json 中的字符串
+- 可见 ASCII 字符（倒计时、版本号、网址等动态内容）
+- 额外字符：fonts/extra_chars.txt（以 # 开头的行是注释）、--extra 指定的文字
+- --charset 指定的常用字表（默认 gb2312，即 GB2312 全部 6763 个汉字和符号）。用户会输入称谓、落款
+  和搜索词，语料也会在线增量同步，常用字都应能用子集显示
+
+子集之外的字在运行时由 main.font_for() 改用完整的系统字体显示，只是这部分文字不享受子集的好处。
+
+同时输出 fonts/bless_subset.json：来源字体、子集包含的全部字符（charset，供 font_for() 判断），
+以及祝福语中出现最多的 --warm-count 个字，开屏页倒计时期间按这个顺序预先渲染。
+
+用法：python tools/build_font.py --font path/to/NotoSansCJK-Regular.ttc [--font-name "Noto Sans CJK SC"]
+                                [--font-number N] [--charset gb2312|gb2312-1|none]
+                                [--extra 文字] [--extra-file fonts/extra_chars.txt]
+                                [--sha256 字体文件的哈希] [--warm-count 600] [--out fonts/bless_subset.ttf]
+需要 fontTools（仅构建机需要，APK 不依赖）。完整字体不要放进打包目录。
+CI（.github/workflows/build.yml）在 buildozer 之前用 Ubuntu 仓库的 fonts-noto-cjk 运行本脚本，
+子集是构建产物，不提交到仓库。
+"""
+
+import os
+import ast
+import sys
+import json
+import hashlib
+import argparse
+from collections import Counter
+
+from fontTools import subset
+from fontTools.ttLib import TTFont
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUT = os.path.join(ROOT_DIR, 'fonts', 'bless_subset.ttf')
+DEFAULT_EXTRA_FILE = os.path.join(ROOT_DIR, 'fonts', 'extra_chars.txt')
+ASCII_CHARS = ''.join(chr(c) for c in range(0x20, 0x7F))
+# 界面文字所在的源文件
+UI_SOURCES = ('main.py', 'festival_calendar.py', 'blessing_index.py')
+
+
+# ==================== 收集字符 ====================
+def json_strings(obj):
+    """JSON 中的全部字符串（键和值）"""
+    if isinstance(obj, str):
+        yield obj
+    elif isinstance(obj, dict):
+        for key, value in obj.items():
+            yield key
+            yield from json_strings(value)
+    elif isinstance(obj, list):
+        for value in obj:
+            yield from json_strings(value)
+
+
+def source_strings(path):
+    """Python 源文件中的全部字符串常量（注释和文档字符串里的字不会显示，但一并保留也无妨）"""
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            yield node.value
+
+
+def read_extra_file(path):
+    if not path or not os.path.exists(path):
+        return ''
+    with open(path, 'r', encoding='utf-8') as f:
+        return ''.join(line.rstrip('\r\n') for line in f if not line.startswith('#'))
+
+
+def gb2312_chars(level1_only=False):
+    """GB2312 字符集：非汉字符号区 1~9（0xA1~0xA9）、一级汉字 16~55 区（0xB0~0xD7，3755 个）、
+    二级汉字 56~87 区（0xD8~0xF7，3008 个）。level1_only=True 时只取一级汉字"""
+    rows = range(0xB0, 0xD8) if level1_only else list(range(0xA1, 0xAA)) + list(range(0xB0, 0xF8))
+    chars = []
+    for high in rows:
+        for low in range(0xA1, 0xFF):
+            try:
+                chars.append(bytes((high, low)).decode('gb2312'))
+            except UnicodeDecodeError:
+                continue
+    return ''.join(chars)
+
+
+def collect(extra='', extra_file=DEFAULT_EXTRA_FILE, charset='gb2312'):
+    """返回 (需要保留的字符集合, 祝福语字频)"""
+    with open(os.path.join(ROOT_DIR, 'data', 'bless.json'), 'r', encoding='utf-8') as f:
+        corpus = json.load(f)
+    with open(os.path.join(ROOT_DIR, 'config.json'), 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    frequency = Counter()
+    for text in json_strings(corpus):
+        frequency.update(text)
+    chars = set(frequency)
+    for name in UI_SOURCES:
+        for text in source_strings(os.path.join(ROOT_DIR, name)):
+            chars.update(text)
+    for text in json_strings(config):
+        chars.update(text)
+    chars.update(ASCII_CHARS)
+    chars.update(read_extra_file(extra_file))
+    chars.update(extra)
+    if charset != 'none':
+        chars.update(gb2312_chars(level1_only=charset == 'gb2312-1'))
+    # 换行、制表符等控制字符不需要字形
+    return {c for c in chars if c.isprintable() or c == ' '}, frequency
+
+
+def frequent_glyphs(frequency, count):
+    return ''.join(c for c, _ in frequency.most_common() if not c.isspace())[:count]
+
+
+# ==================== 子集化 ====================
+def find_font_number(font_path, family):
+    """字体集（ttc）中家族名为 family 的字体序号"""
+    from fontTools.ttLib import TTCollection
+    collection = TTCollection(font_path, lazy=True)
+    for i, font in enumerate(collection.fonts):
+        names = {record.toUnicode() for record in font['name'].names if record.nameID in (1, 4, 16)}
+        if family in names:
+            return i
+    raise SystemExit(f'{font_path} 中没有名为 {family} 的字体')
+
+
+def build_subset(font_path, chars, out_path, font_number=0):
+    """返回 (字体中缺失的字符, 子集包含的字符)"""
+    options = subset.Options()
+    options.font_number = font_number
+    options.layout_features = ['*']
+    options.name_IDs = ['*']
+    options.name_languages = ['*']
+    options.notdef_outline = True
+    options.hinting = False  # 手机屏幕分辨率高，去掉 hinting 可再缩小约三成
+    options.desubroutinize = True
+
+    font = subset.load_font(font_path, options)
+    cmap = font.getBestCmap() or {}
+    missing = sorted(c for c in chars if ord(c) not in cmap)
+    covered = sorted(c for c in chars if ord(c) in cmap)
+
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=[ord(c) for c in chars if ord(c) in cmap])
+    subsetter.subset(font)
+
+    os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+    tmp_path = out_path + '.tmp'
+    subset.save_font(font, tmp_path, options)
+    font.close()
+    os.replace(tmp_path, out_path)
+    return missing, covered
+
+
+def file_digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='把中文字体裁剪为应用用到的字符')
+    parser.add_argument('--font', required=True, help='完整字体文件（ttf / otf / ttc）')
+    parser.add_argument('--font-number', type=int, default=0, help='ttc 字体集中的序号')
+    parser.add_argument('--font-name', help='按家族名在 ttc 字体集中选择字体（如 "Noto Sans CJK SC"）')
+    parser.add_argument('--sha256', help='字体文件应有的 SHA-256，不一致时中止')
+    parser.add_argument('--out', default=DEFAULT_OUT, help='输出的子集字体')
+    parser.add_argument('--extra', default='', help='额外保留的文字')
+    parser.add_argument('--extra-file', default=DEFAULT_EXTRA_FILE, help='额外保留的文字文件')
+    parser.add_argument('--charset', choices=('gb2312', 'gb2312-1', 'none'), default='gb2312',
+                        help='额外保留的常用字表：GB2312 全部 / 只取一级汉字 / 不保留')
+    parser.add_argument('--warm-count', type=int, default=600, help='开屏时预先渲染的高频字个数')
+    args = parser.parse_args(argv)
+
+    source_sha256 = file_digest(args.font)
+    if args.sha256 and source_sha256 != args.sha256.lower():
+        raise SystemExit(f'{args.font} 的 SHA-256 为 {source_sha256}，与 --sha256 不一致')
+    font_number = find_font_number(args.font, args.font_name) if args.font_name else args.font_number
+
+    chars, frequency = collect(args.extra, args.extra_file, args.charset)
+    missing, covered = build_subset(args.font, chars, args.out, font_number)
+    glyphs = len(TTFont(args.out).getGlyphOrder())
+
+    manifest_path = os.path.splitext(args.out)[0] + '.json'
+    manifest = {
+        'font': os.path.basename(args.out),
+        'source': os.path.basename(args.font),
+        'source_sha256': source_sha256,
+        'font_number': font_number,
+        'chars': len(covered),
+        'glyphs': glyphs,
+        'frequent': frequent_glyphs(frequency, args.warm_count),
+        'charset': ''.join(covered),
+    }
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, manifest_path)
+
+    print(f'{args.font} ({os.path.getsize(args.font)} 字节) -> {args.out} ({os.path.getsize(args.out)} 字节)')
+    print(f'保留 {manifest["chars"]} 个字符，{glyphs} 个字形；高频字 {len(manifest["frequent"])} 个写入 {manifest_path}')
+    if missing:
+        preview = ''.join(missing[:40])
+        print(f'警告：字体中缺少 {len(missing)} 个字符：{preview}{"..." if len(missing) > 40 else ""}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+build_images.py - 构建时图片资源处理
+把 images/ 下的运行时图片按屏幕密度（mdpi ~ xxxhdpi）转码成多份尺寸，输出到
+images/dist/<密度>/，并生成 images/dist/variants.json 供运行时按 Window 尺寸和 dpi 选择。
+
+- 原图按 xxxhdpi（4x）设计，例如 160px 宽的图标在界面上是 40dp
+- 不透明图片转成 JPEG，带透明通道的转成 PNG（大图量化为 256 色调色板）
+- 各图片、各密度并行处理（进程池）
+- 按内容寻址：输出文件以原图内容哈希命名，内容相同的图片（如 top.jpg 与 top02~05.jpg）
+  只转码、打包一次；variants.json 记录 逻辑路径 → 内容哈希 → 各密度文件
+- 构建结束时删除不在新清单中的旧变体（原图改动或删除后留下的哈希文件），
+  同目录下 tools/build_atlas.py 生成的图集文件不受影响
+
+用法：python tools/build_images.py [--src images] [--out images/dist] [--jobs N]
+需要 Pillow（仅构建机需要，APK 不依赖）。
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+# 密度名 → 相对 mdpi 的缩放系数
+DENSITIES = (
+    ('mdpi', 1.0),
+    ('hdpi', 1.5),
+    ('xhdpi', 2.0),
+    ('xxhdpi', 3.0),
+    ('xxxhdpi', 4.0),
+)
+SOURCE_SCALE = 4.0
+JPEG_QUALITY = 85
+# 超过这个像素数的透明图片量化为调色板 PNG，小图标保留真彩色
+QUANTIZE_MIN_PIXELS = 256 * 256
+# 只在打包阶段由 buildozer 使用的图片（启动图标、预启动画面），运行时不加载
+BUILD_ONLY = {'icon.png', 'presplash.png'}
+IMAGE_EXTS = ('.png', '.jpg', '.jpeg')
+# 本脚本生成的文件名：16 位内容哈希 + 扩展名（以及中断时留下的 .tmp）
+OUTPUT_NAME_RE = re.compile(r'^[0-9a-f]{16}\.(png|jpg)(\.tmp)?$')
+
+
+def _has_alpha(im):
+    if im.mode in ('RGBA', 'LA') or (im.mode == 'P' and 'transparency' in im.info):
+        return im.convert('RGBA').getextrema()[3][0] < 255
+    return False
+
+
+def content_hash(path):
+    """原图内容哈希（取前 16 位十六进制作为文件名）"""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def transcode(job):
+    """处理一份图片内容的一个密度，返回 (内容哈希, 密度, 输出路径, 尺寸)"""
+    src_path, digest, out_dir, density, scale = job
+    with Image.open(src_path) as im:
+        im.load()
+        alpha = _has_alpha(im)
+        factor = scale / SOURCE_SCALE
+        size = (max(1, round(im.width * factor)), max(1, round(im.height * factor)))
+        im = im.convert('RGBA' if alpha else 'RGB')
+        if size != im.size:
+            im = im.resize(size, Image.LANCZOS)
+
+    target_dir = os.path.join(out_dir, density)
+    os.makedirs(target_dir, exist_ok=True)
+    if alpha:
+        out_path = os.path.join(target_dir, digest + '.png')
+        if size[0] * size[1] >= QUANTIZE_MIN_PIXELS:
+            im = im.quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+        tmp_path = out_path + '.tmp'
+        im.save(tmp_path, 'PNG', optimize=True)
+    else:
+        out_path = os.path.join(target_dir, digest + '.jpg')
+        tmp_path = out_path + '.tmp'
+        im.save(tmp_path, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    os.replace(tmp_path, out_path)
+    return digest, density, out_path, size
+
+
+def collect_jobs(src_dir, out_dir):
+    """返回 (转码任务, {逻辑路径: 内容哈希}, {内容哈希: 原图路径})，相同内容只生成一组任务"""
+    jobs = []
+    assets = {}
+    sources = {}
+    for name in sorted(os.listdir(src_dir)):
+        path = os.path.join(src_dir, name)
+        if not os.path.isfile(path) or not name.lower().endswith(IMAGE_EXTS) or name in BUILD_ONLY:
+            continue
+        digest = content_hash(path)
+        assets[f'{os.path.basename(os.path.normpath(src_dir))}/{name}'] = digest
+        if digest in sources:
+            continue
+        sources[digest] = path
+        for density, scale in DENSITIES:
+            jobs.append((path, digest, out_dir, density, scale))
+    return jobs, assets, sources
+
+
+def prune_outputs(out_dir, variants):
+    """删除各密度目录中不在清单里的旧变体，返回删除的文件数"""
+    keep = {os.path.normpath(v['path']) for d in variants.values() for v in d.values()}
+    removed = 0
+    for density, _ in DENSITIES:
+        target_dir = os.path.join(out_dir, density)
+        if not os.path.isdir(target_dir):
+            continue
+        for name in os.listdir(target_dir):
+            path = os.path.normpath(os.path.join(target_dir, name))
+            if OUTPUT_NAME_RE.match(name) and path not in keep:
+                os.remove(path)
+                removed += 1
+    return removed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='按屏幕密度生成压缩后的图片资源')
+    parser.add_argument('--src', default='images')
+    parser.add_argument('--out', default=os.path.join('images', 'dist'))
+    parser.add_argument('--jobs', type=int, default=None, help='进程数，默认为 CPU 核数')
+    args = parser.parse_args(argv)
+
+    jobs, assets, sources = collect_jobs(args.src, args.out)
+    variants = {}
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        for digest, density, out_path, size in pool.map(transcode, jobs):
+            variants.setdefault(digest, {})[density] = {
+                'path': out_path.replace(os.sep, '/'),
+                'size': list(size),
+            }
+
+    manifest_path = os.path.join(args.out, 'variants.json')
+    with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump({'densities': dict(DENSITIES), 'assets': assets, 'images': variants},
+                  f, ensure_ascii=False, indent=1)
+    os.replace(manifest_path + '.tmp', manifest_path)
+    removed = prune_outputs(args.out, variants)
+
+    src_bytes = sum(os.path.getsize(os.path.join(args.src, os.path.basename(logical))) for logical in assets)
+    out_bytes = sum(os.path.getsize(v['path']) for d in variants.values() for v in d.values())
+    print(f'{len(assets)} 张图片（{len(sources)} 份不同内容）, {len(jobs)} 个变体: '
+          f'原图 {src_bytes} 字节 -> 全部变体 {out_bytes} 字节；删除旧变体 {removed} 个')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+update_checker.py - 后台检查更新
+- 状态保存在缓存目录的 update_state.json：上次检查时间、服务器上的最新版本信息、
+  ETag / Last-Modified 校验值、用户点过“以后再说”的版本
+- 两次检查之间至少间隔 interval 秒（失败后间隔 retry_interval 秒再试），间隔内不发请求
+- 带校验值请求，服务器返回 304 时沿用记录的版本信息
+- 只有比当前版本新、且不是用户已忽略的版本才回调界面
+
+请求通过 net_client.NetClient 在后台线程完成，本模块不依赖 Kivy。
+"""
+
+import os
+import re
+import json
+import time
+
+
+def parse_version(version_str):
+    """'v2.6.110' -> (2, 6, 110)；无法识别的部分按 0 处理"""
+    parts = str(version_str).strip().lstrip('vV').split('.')
+    return tuple(int(m.group()) if (m := re.match(r'\d+', p)) else 0 for p in parts)
+
+
+def is_newer_version(latest, current):
+    return parse_version(latest) > parse_version(current)
+
+
+class UpdateChecker:
+    def __init__(self, state_path, net, current_version, endpoint='update',
+                 interval=24 * 3600, retry_interval=600, clock=time.time):
+        self.state_path = state_path
+        self.net = net
+        self.current_version = current_version
+        self.endpoint = endpoint
+        self.interval = interval
+        self.retry_interval = retry_interval
+        self.clock = clock
+        self._state = None
+        self._checking = False
+
+    @property
+    def state(self):
+        if self._state is None:
+            try:
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    self._state = json.load(f)
+            except (OSError, ValueError):
+                self._state = {}
+        return self._state
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.state_path)
+
+    def due(self):
+        """距上次成功检查已超过 interval，且距上次尝试已超过 retry_interval"""
+        now = self.clock()
+        state = self.state
+        return (now - state.get('last_check', 0) >= self.interval
+                and now - state.get('last_attempt', 0) >= self.retry_interval)
+
+    def check(self, on_update, on_failure=None, force=False):
+        """需要时发起检查，返回是否真的发出了请求。
+        有可提示的新版本时回调 on_update(info)，info 含 version / message / url；
+        force=True 时忽略检查间隔，已忽略的版本也会提示。"""
+        if self._checking or not (force or self.due()):
+            return False
+        self._checking = True
+        state = self.state
+        state['last_attempt'] = self.clock()
+        headers = {}
+        if state.get('info'):
+            if state.get('etag'):
+                headers['If-None-Match'] = state['etag']
+            if state.get('last_modified'):
+                headers['If-Modified-Since'] = state['last_modified']
+
+        def _on_response(resp):
+            self._checking = False
+            if resp.status == 304:
+                info = state.get('info') or {}
+            else:
+                data = resp.data if isinstance(resp.data, dict) else {}
+                info = {key: data.get(key) for key in ('version', 'message', 'url')}
+                resp_headers = {k.lower(): v for k, v in resp.headers.items()}
+                state['etag'] = resp_headers.get('etag')
+                state['last_modified'] = resp_headers.get('last-modified')
+                state['info'] = info
+            state['last_check'] = self.clock()
+            self._save()
+            if self.should_notify(info.get('version'), force):
+                on_update(info)
+
+        def _on_failure(error):
+            self._checking = False
+            self._save()
+            if on_failure:
+                on_failure(error)
+
+        self.net.get_json(self.endpoint, _on_response, _on_failure, headers=headers)
+        return True
+
+    def should_notify(self, version, force=False):
+        if not version or not is_newer_version(version, self.current_version):
+            return False
+        return force or version != self.state.get('dismissed_version')
+
+    def dismiss(self, version):
+        """用户选择“以后再说”：同一版本不再自动提示"""
+        self.state['dismissed_version'] = version
+        self._save()